@@ -10,7 +10,8 @@ from flask_cors import CORS
 
 app = Flask(__name__)
 app.register_blueprint(app_views)
-cors = CORS(app, resources={r"/api/v1/*": {"origins": "*"}})
+cors = CORS(app, resources={r"/api/v1/*": {"origins": "*"}},
+            expose_headers=["X-Next-Cursor", "ETag"])
 
 
 @app.teardown_appcontext
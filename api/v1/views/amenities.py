@@ -6,11 +6,19 @@ from api.v1.views import app_views
 from flask import jsonify, abort, request, make_response
 from models import storage
 from models.amenity import Amenity
+from api.v1.views.cache import cached
+from api.v1.views.conditional import object_response, versioned
+from api.v1.views.pagination import page_args, paginated
 
 
 @app_views.route('/amenities', methods=['GET'], strict_slashes=False)
+@versioned(Amenity)
+@cached(Amenity)
 def get_all_amenities():
     """ get amenities by id """
+    limit, after = page_args(request.args)
+    if limit is not None or after is not None:
+        return paginated(storage.page(Amenity, limit, after), limit)
     all_list = [obj.to_dict() for obj in storage.all(Amenity).values()]
     return jsonify(all_list)
 
@@ -22,7 +30,7 @@ def get_amenity(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if amenity is None:
         abort(404)
-    return jsonify(amenity.to_dict())
+    return object_response(amenity)
 
 
 @app_views.route('/amenities/<string:amenity_id>', methods=['DELETE'],
@@ -63,5 +71,5 @@ def put_amenity(amenity_id):
     for key, value in data.items():
         if key not in ['id', 'created_at', 'updated_at']:
             setattr(amenity, key, value)
-    storage.save()
+    amenity.save()
     return jsonify(amenity.to_dict()), 200
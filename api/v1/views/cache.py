@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+"""
+Cache of the responses of read-heavy views, kept in a pluggable backend
+"""
+from api.v1.views.cache_backends import backend_from_env
+from flask import Response, make_response, request
+from functools import wraps
+import json
+from models import storage
+from os import getenv
+from threading import Lock
+
+# generation bumped on every change, for responses built from every class
+ANY = "*"
+# generation bumped when storage reloads, which may change any class
+RELOAD = ""
+
+
+class ResponseCache:
+    """
+    Cache of responses that expire after ttl seconds and are ignored as
+    soon as storage changes a class they were built from
+
+    Every entry is stored with the generations of its classes when it was
+    built; invalidating a class bumps its generation in the backend, so a
+    shared backend carries invalidations to every process using it.
+    """
+
+    def __init__(self, backend, ttl=60):
+        """Creates a cache keeping its entries in backend"""
+        self.backend = backend
+        self.ttl = ttl
+        self.__lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def __names(names):
+        """returns the generations a response built from names depends on"""
+        if None in names:
+            return (ANY,)
+        return tuple(names) + (RELOAD,)
+
+    def generation(self, names):
+        """
+        Returns the generation of names, the class names a response is
+        built from (None standing for every class)
+        """
+        return list(self.backend.generations(self.__names(names)))
+
+    def get(self, key, names):
+        """
+        Returns the (body, status, headers) stored under key if it was
+        built at the current generation of names, None otherwise
+        """
+        value = self.backend.get(key)
+        if value is not None:
+            meta, body = value.split(b"\n", 1)
+            generation, status, headers = json.loads(meta.decode())
+            if generation == self.generation(names):
+                self.__count("hits", 1)
+                return body, status, headers
+        self.__count("misses", 1)
+        return None
+
+    def put(self, key, generation, value):
+        """
+        Stores value, (body, status, headers) built at generation, under
+        key
+        """
+        if self.backend.size < 1:
+            return
+        body, status, headers = value
+        meta = json.dumps([generation, status, headers]).encode()
+        self.__count("evictions",
+                     self.backend.set(key, meta + b"\n" + body, self.ttl))
+
+    def invalidate(self, name=None):
+        """
+        Makes the responses built from objects of class name, or every
+        response if name is None, stale
+        """
+        self.backend.bump((ANY, RELOAD if name is None else name))
+        self.__count("invalidations", 1)
+
+    def __count(self, counter, n):
+        """adds n to counter"""
+        with self.__lock:
+            setattr(self, counter, getattr(self, counter) + n)
+
+    def stats(self):
+        """Returns the counters of the cache in this process"""
+        with self.__lock:
+            return {"backend": type(self.backend).__name__,
+                    "size": self.backend.count(),
+                    "max_size": self.backend.size, "ttl": self.ttl,
+                    "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions,
+                    "invalidations": self.invalidations}
+
+
+cache = ResponseCache(backend_from_env(), float(getenv('HBNB_CACHE_TTL', 60)))
+storage.subscribe(cache.invalidate)
+
+
+def cached(*classes):
+    """
+    Decorator caching the successful responses of a view by requested URL,
+    stale whenever storage changes objects of classes (None standing for
+    every class)
+    """
+    names = tuple(sorted(cls.__name__ for cls in classes if cls is not None))
+    if None in classes:
+        names = (None,)
+
+    def decorator(view):
+        """returns view answering from the cache when it can"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """returns the cached response or the response of view"""
+            key = request.full_path
+            value = cache.get(key, names)
+            if value is not None:
+                body, status, headers = value
+                return Response(body, status, headers)
+            generation = cache.generation(names)
+            # pick up what other processes saved before the generation was
+            # read, so it is never cached under it
+            storage.close()
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                cache.put(key, generation,
+                          (response.get_data(), response.status_code,
+                           list(response.headers.items())))
+            return response
+        return wrapper
+    return decorator
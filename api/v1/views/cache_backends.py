@@ -0,0 +1,158 @@
+#!/usr/bin/python3
+"""
+Stores the response cache can keep its entries and generations in
+"""
+from collections import OrderedDict
+from os import getenv
+import sqlite3
+from threading import Lock, local
+from time import time
+
+
+class MemoryBackend:
+    """
+    Keeps entries in a bounded LRU dictionary private to this process
+    """
+
+    def __init__(self, size=1024):
+        """Creates an empty store of at most size entries"""
+        self.size = size
+        self.__entries = OrderedDict()
+        self.__generations = {}
+        self.__lock = Lock()
+
+    def get(self, key):
+        """Returns the bytes stored under key, None if missing or expired"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time():
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        """
+        Stores the bytes value under key for ttl seconds and returns the
+        number of least recently used entries evicted to make room
+        """
+        with self.__lock:
+            self.__entries.pop(key, None)
+            self.__entries[key] = (time() + ttl, value)
+            evicted = 0
+            while len(self.__entries) > self.size:
+                self.__entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def generations(self, names):
+        """Returns the generation of each of names"""
+        with self.__lock:
+            return tuple(self.__generations.get(name, 0) for name in names)
+
+    def bump(self, names):
+        """Increments the generation of each of names"""
+        with self.__lock:
+            for name in names:
+                self.__generations[name] = self.__generations.get(name,
+                                                                  0) + 1
+
+    def count(self):
+        """Returns the number of entries stored"""
+        with self.__lock:
+            return len(self.__entries)
+
+
+class SQLiteBackend:
+    """
+    Keeps entries in a SQLite file, shared by every process opening the
+    same path, so workers share responses and invalidations
+    """
+
+    def __init__(self, path, size=1024):
+        """Opens, creating it if needed, the store at path"""
+        self.path = path
+        self.size = size
+        self.__local = local()
+        with self.__connection() as connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS entries "
+                               "(key TEXT PRIMARY KEY, value BLOB NOT NULL, "
+                               "expires REAL NOT NULL)")
+            connection.execute("CREATE INDEX IF NOT EXISTS entries_expires "
+                               "ON entries (expires)")
+            connection.execute("CREATE TABLE IF NOT EXISTS generations "
+                               "(name TEXT PRIMARY KEY, "
+                               "value INTEGER NOT NULL)")
+
+    def __connection(self):
+        """returns the connection of the current thread, opening it first"""
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=10)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.__local.connection = connection
+        return connection
+
+    def get(self, key):
+        """Returns the bytes stored under key, None if missing or expired"""
+        row = self.__connection().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires >= ?",
+            (key, time())).fetchone()
+        return None if row is None else row[0]
+
+    def set(self, key, value, ttl):
+        """
+        Stores the bytes value under key for ttl seconds and returns the
+        number of entries evicted to make room, expired ones first, then
+        those closest to expiring
+        """
+        now = time()
+        with self.__connection() as connection:
+            connection.execute("INSERT OR REPLACE INTO entries "
+                               "VALUES (?, ?, ?)", (key, value, now + ttl))
+            count = connection.execute(
+                "SELECT COUNT(*) FROM entries").fetchone()[0]
+            if count <= self.size:
+                return 0
+            connection.execute("DELETE FROM entries WHERE expires < ?",
+                               (now,))
+            connection.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries "
+                "ORDER BY expires LIMIT max(0, (SELECT COUNT(*) "
+                "FROM entries) - ?))", (self.size,))
+            return count - connection.execute(
+                "SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def generations(self, names):
+        """Returns the generation of each of names"""
+        rows = dict(self.__connection().execute(
+            "SELECT name, value FROM generations WHERE name IN ({})".format(
+                ", ".join("?" * len(names))), names).fetchall())
+        return tuple(rows.get(name, 0) for name in names)
+
+    def bump(self, names):
+        """Increments the generation of each of names"""
+        with self.__connection() as connection:
+            connection.executemany(
+                "INSERT INTO generations VALUES (?, 1) ON CONFLICT(name) "
+                "DO UPDATE SET value = value + 1", [(name,) for name in names])
+
+    def count(self):
+        """Returns the number of entries stored"""
+        return self.__connection().execute(
+            "SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def backend_from_env():
+    """
+    Returns the backend chosen by HBNB_CACHE_BACKEND, memory (default) or
+    sqlite at HBNB_CACHE_PATH, holding at most HBNB_CACHE_SIZE entries
+    """
+    size = int(getenv('HBNB_CACHE_SIZE', 1024))
+    if getenv('HBNB_CACHE_BACKEND', 'memory') == 'sqlite':
+        return SQLiteBackend(getenv('HBNB_CACHE_PATH', 'hbnb_cache.db'),
+                             size)
+    return MemoryBackend(size)
@@ -3,6 +3,8 @@
 Creates new view for City obj that handles the restful API
 """
 from api.v1.views import app_views
+from api.v1.views.cache import cached
+from api.v1.views.conditional import object_response, versioned
 from flask import jsonify, abort, request
 from models import storage
 from models.state import State
@@ -11,6 +13,8 @@ from models.city import City
 
 @app_views.route(
         '/states/<state_id>/cities', methods=['GET'], strict_slashes=False)
+@versioned(State, City)
+@cached(State, City)
 def get_cities_by_state(state_id):
     """
     Retrieves a list of all cities in certain state
@@ -33,7 +37,7 @@ def get_city_by_id(city_id):
     city = storage.get(City, city_id)
     if not city:
         abort(404)
-    return jsonify(city.to_dict())
+    return object_response(city)
 
 
 @app_views.route('/cities/<city_id>', methods=['DELETE'], strict_slashes=False)
@@ -45,6 +49,7 @@ def delete_city(city_id):
     if not city:
         abort(404)
     storage.delete(city)
+    storage.save()
     return jsonify({}), 200
 
 
@@ -64,7 +69,7 @@ def post_city(state_id):
         abort(400, 'Missing name')
     city = City(**data)
     setattr(city, 'state_id', state.id)
-    storage.save()
+    city.save()
     city_json = city.to_dict()
     return jsonify(city_json), 201
 
@@ -85,5 +90,5 @@ def put_city(city_id):
     for key, value in data.items():
         if key not in ['id', 'state_id', 'created_at', 'updated_at']:
             setattr(city, key, value)
-    storage.save()
+    city.save()
     return jsonify(city.to_dict()), 200
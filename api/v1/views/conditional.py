@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Helpers to answer conditional GETs with 304 Not Modified
+"""
+from datetime import timezone
+from flask import Response, jsonify, make_response, request
+from functools import wraps
+from hashlib import md5
+from models import storage
+from models.base_model import isoformat
+
+
+def conditional(etag, build, last_modified=None):
+    """
+    Returns a 304 response if the client already has the representation
+    tagged etag (or last modified at last_modified, a naive UTC datetime),
+    otherwise the response built by calling build, tagged with them
+    """
+    if last_modified is not None:
+        last_modified = last_modified.replace(microsecond=0,
+                                              tzinfo=timezone.utc)
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    else:
+        since = request.if_modified_since
+        fresh = (last_modified is not None and since is not None and
+                 last_modified <= since)
+    response = Response(status=304) if fresh else build()
+    response.set_etag(etag)
+    # caches may keep the response but must revalidate it before reuse
+    response.headers['Cache-Control'] = 'no-cache'
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def object_response(obj, build=None):
+    """
+    Returns the conditional response for obj, tagged with a strong ETag
+    made of its id and updated_at; build defaults to jsonify(obj.to_dict())
+    """
+    if build is None:
+        def build():
+            """returns the JSON response of obj"""
+            return jsonify(obj.to_dict())
+    updated_at = obj.updated_at
+    etag = md5('{}|{}'.format(obj.id, isoformat(updated_at)).encode())
+    return conditional(etag.hexdigest(), build, updated_at)
+
+
+def versioned(*classes):
+    """
+    Decorator answering conditional GETs of a collection view before
+    running it, with an ETag made of the requested URL and the storage
+    version of each of classes (None standing for every class)
+    """
+    def decorator(view):
+        """returns view answering 304 when the collection is unchanged"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """returns 304 or the response of view"""
+            versions = [storage.version(cls) for cls in classes]
+            versions.append(request.full_path)
+            etag = md5('|'.join(versions).encode()).hexdigest()
+            return conditional(etag, lambda: make_response(
+                view(*args, **kwargs)))
+        return wrapper
+    return decorator
@@ -5,7 +5,11 @@ This module contains endpoint(route) status
 from models import storage
 from flask import Flask
 from api.v1.views import app_views
-from flask import jsonify
+from api.v1.views.cache import cache, cached
+from api.v1.views.conditional import versioned
+from flask import abort, jsonify, request
+from hmac import compare_digest
+from os import getenv
 
 
 @app_views.route('/status', strict_slashes=False)
@@ -17,13 +21,40 @@ def status():
 
 
 @app_views.route('/stats', strict_slashes=False)
+@versioned(None)
+@cached(None)
 def count():
     """
     Retrieves the number of each objects by type
     """
-    return jsonify({"amenities": storage.count("Amenity"),
-                    "cities": storage.count("City"),
-                    "places": storage.count("Place"),
-                    "reviews": storage.count("Review"),
-                    "states": storage.count("State"),
-                    "users": storage.count("User")})
+    counts = storage.counts()
+    return jsonify({"amenities": counts["Amenity"],
+                    "cities": counts["City"],
+                    "places": counts["Place"],
+                    "reviews": counts["Review"],
+                    "states": counts["State"],
+                    "users": counts["User"]})
+
+
+@app_views.route('/stats/cache', strict_slashes=False)
+def cache_stats():
+    """
+    Retrieves the counters of the response cache
+    """
+    return jsonify(cache.stats())
+
+
+@app_views.route('/internal/pool', strict_slashes=False)
+def pool_stats():
+    """
+    Retrieves the state and counters of the database connection pool, to
+    clients sending the HBNB_API_INTERNAL_TOKEN as a bearer token; the
+    route does not exist when that variable is not set
+    """
+    token = getenv('HBNB_API_INTERNAL_TOKEN')
+    sent = request.headers.get('Authorization', '')
+    if (not token or not hasattr(storage, 'pool_stats') or
+            not compare_digest(sent.encode(),
+                               'Bearer {}'.format(token).encode())):
+        abort(404)
+    return jsonify(storage.pool_stats())
@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""
+Helpers to page through collections by (created_at, id)
+"""
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error
+from flask import abort, jsonify
+from models.base_model import isoformat, strptime
+
+
+def page_args(args):
+    """
+    Returns the (limit, after) pair read from the limit and cursor keys
+    of args, None for each one that is missing
+    """
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            abort(400, 'Invalid limit')
+        if limit < 1:
+            abort(400, 'Invalid limit')
+    cursor = args.get('cursor')
+    after = None
+    if cursor:
+        try:
+            after = urlsafe_b64decode(cursor.encode()).decode().split('|')
+            created_at, obj_id = after
+            strptime(created_at)
+        except (AttributeError, Error, UnicodeError, ValueError):
+            abort(400, 'Invalid cursor')
+    return limit, after
+
+
+def paginated(objs, limit, dicts=None):
+    """
+    Returns the JSON response listing objs, with an X-Next-Cursor header
+    pointing after the last one when the page is full
+    """
+    if dicts is None:
+        dicts = [obj.to_dict() for obj in objs]
+    response = jsonify(dicts)
+    if limit is not None and len(objs) == limit:
+        last = objs[-1]
+        created_at = last.created_at
+        if not isinstance(created_at, str):
+            created_at = isoformat(created_at)
+        cursor = '{}|{}'.format(created_at, last.id)
+        response.headers['X-Next-Cursor'] = urlsafe_b64encode(
+            cursor.encode()).decode()
+    return response
@@ -2,6 +2,9 @@
 """ API actions for Place objects """
 from flask import Flask, jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.conditional import object_response, versioned
+from api.v1.views.pagination import page_args, paginated
+from api.v1.views.streaming import stream_json
 from models import storage
 from models.state import State
 from models.place import Place
@@ -12,11 +15,68 @@ import logging
 
 logging.basicConfig(level=logging.DEBUG)
 
+# Place attributes places_search filters on with {"min": ..., "max": ...}
+RANGES = ('price_by_night', 'max_guest', 'number_rooms', 'number_bathrooms')
+
+
+def range_args(data):
+    """ Returns the (min, max) bounds given for each attribute of RANGES """
+    ranges = {}
+    for attr in RANGES:
+        bounds = data.get(attr)
+        if bounds is None:
+            continue
+        if not isinstance(bounds, dict):
+            abort(400, description="Invalid " + attr)
+        low, high = bounds.get('min'), bounds.get('max')
+        for bound in (low, high):
+            if bound is not None and (isinstance(bound, bool) or
+                                      not isinstance(bound, (int, float))):
+                abort(400, description="Invalid " + attr)
+        ranges[attr] = (low, high)
+    return ranges
+
+
+def is_number(value, low, high):
+    """ Tells if value is a number between low and high """
+    return (not isinstance(value, bool) and
+            isinstance(value, (int, float)) and low <= value <= high)
+
+
+def area_args(data):
+    """
+    Returns the (box, near) pair read from the bbox key of data,
+    [south, west, north, east], and its near key, {"latitude": ...,
+    "longitude": ..., "radius": <kilometers>}, None for each one missing
+    """
+    box = data.get('bbox')
+    if box is not None:
+        if not isinstance(box, list) or len(box) != 4:
+            abort(400, description="Invalid bbox")
+        south, west, north, east = box
+        if not (is_number(south, -90, 90) and is_number(north, -90, 90) and
+                is_number(west, -180, 180) and
+                is_number(east, -180, 180) and south <= north):
+            abort(400, description="Invalid bbox")
+        box = (south, west, north, east)
+    near = data.get('near')
+    if near is not None:
+        if not isinstance(near, dict):
+            abort(400, description="Invalid near")
+        near = (near.get('latitude'), near.get('longitude'),
+                near.get('radius'))
+        if not (is_number(near[0], -90, 90) and
+                is_number(near[1], -180, 180) and
+                is_number(near[2], 0, float('inf'))):
+            abort(400, description="Invalid near")
+    return box, near
+
 
 @app_views.route(
         '/cities/<city_id>/places',
         methods=['GET'],
         strict_slashes=False)
+@versioned(City, Place)
 def get_places(city_id):
     """ Retrieves the list of all Place objects of a City """
     logging.debug(f"Retrieving places for city_id: {city_id}")
@@ -24,8 +84,12 @@ def get_places(city_id):
     if not city:
         logging.error("City not found")
         abort(404)
-    places = [place.to_dict() for place in city.places]
-    return jsonify(places)
+    limit, after = page_args(request.args)
+    if limit is not None or after is not None:
+        return paginated(storage.places_in(cities=[city_id], limit=limit,
+                                           after=after), limit)
+    places = storage.iter_places_in(cities=[city_id])
+    return stream_json(place.to_dict() for place in places)
 
 
 @app_views.route('/places/<place_id>', methods=['GET'], strict_slashes=False)
@@ -36,7 +100,7 @@ def get_place(place_id):
     if not place:
         logging.error("Place not found")
         abort(404)
-    return jsonify(place.to_dict())
+    return object_response(place)
 
 
 @app_views.route(
@@ -77,7 +141,7 @@ def post_place(city_id):
         abort(404)  # No valid user
     data['city_id'] = city_id
     place = Place(**data)
-    storage.save()
+    place.save()
     place_json = place.to_dict()
     return jsonify(place_json), 201
 
@@ -98,54 +162,56 @@ def put_place(place_id):
     for key, value in data.items():
         if key not in ['id', 'user_id', 'city_id', 'created_at', 'updated_at']:
             setattr(place, key, value)
-    storage.save()
+    place.save()
     return jsonify(place.to_dict()), 200
 
+
 @app_views.route('/places_search', methods=['POST'], strict_slashes=False)
 def places_search():
+    """
+    Retrieves the places matching the filters of the JSON body
+    """
     if not request.is_json:
         abort(400, description="Not a JSON")
-    
+
     data = request.get_json()
 
     if not data:
         # Retrieve all Place objects if the JSON body is empty
-        places = storage.all(Place).values()
-        return jsonify([place.to_dict() for place in places])
+        places = storage.iter_all(Place)
+        return stream_json(place.to_dict() for place in places)
 
     states = data.get('states', [])
     cities = data.get('cities', [])
     amenities = data.get('amenities', [])
-
-    places = []
-
-    if states or cities:
-        # Retrieve all places for given states
-        for state_id in states:
-            state = storage.get(State, state_id)
-            if state:
-                for city in state.cities:
-                    places.extend(city.places)
-        
-        # Retrieve all places for given cities
-        for city_id in cities:
-            city = storage.get(City, city_id)
-            if city and city not in [c.id for c in places]:  # Avoid duplicates
-                places.extend(city.places)
+    limit, after = page_args(data)
+    ranges = range_args(data)
+    box, near = area_args(data)
+    text = data.get('q')
+    if text is not None and not isinstance(text, str):
+        abort(400, description="Invalid q")
+
+    # Retrieve the places of the given states and cities (each place once),
+    # or all places if none are provided, having all the given amenities,
+    # within the given ranges and areas and matching the q words; a whole
+    # result set is read as it is streamed
+    if limit is None and after is None:
+        places = storage.iter_places_in(states, cities, amenities, ranges,
+                                        box, near, text)
     else:
-        # Retrieve all places if no states or cities are provided
-        places = storage.all(Place).values()
-    
-     # Filter places by amenities if provided
-    if amenities:
-        places = [place for place in places if all(amenity in [a.id for a in place.amenities] for amenity in amenities)]
+        places = storage.places_in(states, cities, amenities, limit, after,
+                                   ranges, box, near, text)
 
     # Convert to dict, including amenities conversion
-    place_list = []
-    for place in places:
-        place_dict = place.to_dict()
-        place_dict['amenities'] = [amenity.to_dict() for amenity in place.amenities]  # Convert amenities to dict
-        place_list.append(place_dict)
-
-    return jsonify(place_list)
-
+    def place_dicts():
+        """yields the dictionary of each place with its amenities"""
+        for place in places:
+            place_dict = place.to_dict()
+            place_dict['amenities'] = [amenity.to_dict()
+                                       for amenity in place.amenities]
+            yield place_dict
+
+    # A page is small, a whole result set is streamed
+    if limit is None:
+        return stream_json(place_dicts())
+    return paginated(places, limit, list(place_dicts()))
@@ -4,6 +4,7 @@ from models.place import Place
 from models.amenity import Amenity
 from models import storage
 from api.v1.views import app_views
+from api.v1.views.conditional import versioned
 from os import environ
 from flask import abort, jsonify, make_response, request
 from flasgger.utils import swag_from
@@ -13,6 +14,7 @@ from flasgger.utils import swag_from
                  strict_slashes=False)
 @swag_from('documentation/place_amenity/get_places_amenities.yml',
            methods=['GET'])
+@versioned(Place, Amenity)
 def get_place_amenities(place_id):
     """
     Retrieves the list of all Amenity objects of a Place
@@ -58,7 +60,7 @@ def delete_place_amenity(place_id, amenity_id):
             abort(404)
         place.amenity_ids.remove(amenity_id)
 
-    storage.save()
+    place.save()
     return make_response(jsonify({}), 200)
 
 
@@ -91,5 +93,5 @@ def post_place_amenity(place_id, amenity_id):
         else:
             place.amenity_ids.append(amenity_id)
 
-    storage.save()
+    place.save()
     return make_response(jsonify(amenity.to_dict()), 201)
@@ -6,10 +6,18 @@ from api.v1.views import app_views
 from flask import jsonify, request, abort
 from models.state import State
 from models import storage
+from api.v1.views.cache import cached
+from api.v1.views.conditional import object_response, versioned
+from api.v1.views.pagination import page_args, paginated
 
 
 @app_views.route('/states', methods=['GET'], strict_slashes=False)
+@versioned(State)
+@cached(State)
 def get_all_states():
+    limit, after = page_args(request.args)
+    if limit is not None or after is not None:
+        return paginated(storage.page(State, limit, after), limit)
     states = storage.all(State).values()
     state_json = [state.to_dict() for state in states]
     return jsonify(state_json)
@@ -20,8 +28,7 @@ def get_state_by_id(state_id):
     state = storage.get(State, state_id)
     if state is None:
         abort(404)
-    state_json = state.to_dict()
-    return jsonify(state_json)
+    return object_response(state)
 
 
 @app_views.route('/states/<state_id>', methods=['DELETE'],
@@ -0,0 +1,23 @@
+#!/usr/bin/python3
+"""
+Helper to send large JSON arrays without building them in memory
+"""
+from flask import Response, stream_with_context
+import json
+
+
+def stream_json(dicts):
+    """
+    Returns a response sending the JSON array of the dictionaries yielded
+    by dicts one at a time, so the body is never held in memory at once
+    """
+    def generate():
+        """yields the JSON array chunk by chunk"""
+        separator = '['
+        for obj_dict in dicts:
+            yield separator + json.dumps(obj_dict)
+            separator = ','
+        yield '[]\n' if separator == '[' else ']\n'
+
+    return Response(stream_with_context(generate()),
+                    mimetype='application/json')
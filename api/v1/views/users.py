@@ -6,13 +6,18 @@ from api.v1.views import app_views
 from flask import jsonify, request, abort
 from models.user import User
 from models import storage
+from api.v1.views.conditional import object_response, versioned
+from api.v1.views.pagination import page_args, paginated
+from api.v1.views.streaming import stream_json
 
 
 @app_views.route('/users', methods=['GET'], strict_slashes=False)
+@versioned(User)
 def get_all_users():
-    users = storage.all(User).values()
-    user_json = [user.to_dict() for user in users]
-    return jsonify(user_json)
+    limit, after = page_args(request.args)
+    if limit is not None or after is not None:
+        return paginated(storage.page(User, limit, after), limit)
+    return stream_json(user.to_dict() for user in storage.iter_all(User))
 
 
 @app_views.route('/users/<user_id>', methods=['GET'],
@@ -21,7 +26,7 @@ def get_user_by_id(user_id):
     user = storage.get(User, user_id)
     if user is None:
         abort(404)
-    return jsonify(user.to_dict())
+    return object_response(user)
 
 
 @app_views.route('/users/<user_id>', methods=['DELETE'],
@@ -61,5 +66,5 @@ def put_user(user_id):
     for key, value in data.items():
         if key not in ['id', 'created_at', 'updated_at']:
             setattr(user, key, value)
-    storage.save()
+    user.save()
     return jsonify(user.to_dict()), 200
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Measures FileStorage.reload() throughput with the strptime and the
+fromisoformat parsing of created_at and updated_at
+
+usage: ./benchmark_reload.py [number of objects, 1000000 by default]
+"""
+from datetime import datetime, timedelta
+import json
+import models
+from models import base_model
+from models.engine.file_storage import FileStorage
+import os
+import sys
+import tempfile
+from time import perf_counter
+import uuid
+
+
+def write(path, count):
+    """writes a file.json of count reviews, with distinct timestamps"""
+    start = datetime(2017, 9, 28, 21, 3, 54, 52298)
+    with open(path, "w") as f:
+        f.write("{")
+        for i in range(count):
+            created_at = start + timedelta(seconds=i, microseconds=i)
+            review = {"__class__": "Review", "id": str(uuid.uuid4()),
+                      "created_at": base_model.isoformat(created_at),
+                      "updated_at": base_model.isoformat(
+                          created_at + timedelta(minutes=1)),
+                      "place_id": str(uuid.uuid4()),
+                      "user_id": str(uuid.uuid4()), "text": "x" * 100}
+            f.write("{}{}: {}".format(", " if i else "",
+                                      json.dumps("Review." + review["id"]),
+                                      json.dumps(review)))
+        f.write("}")
+
+
+def reload(path):
+    """returns the seconds a FileStorage takes to reload path"""
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__lazy = False
+    storage = FileStorage()
+    begin = perf_counter()
+    storage.reload()
+    elapsed = perf_counter() - begin
+    FileStorage._FileStorage__objects = {}
+    FileStorage._FileStorage__indexed = None
+    return elapsed
+
+
+if __name__ == "__main__":
+    if models.storage_t == "db":
+        sys.exit("benchmark_reload.py measures FileStorage")
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    fast = base_model.strptime
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "file.json")
+        write(path, count)
+        for name, parse in (("strptime", lambda value: datetime.strptime(
+                                value, base_model.time)),
+                            ("fromisoformat", fast)):
+            base_model.strptime = parse
+            elapsed = reload(path)
+            print("{:>13}: {} objects in {:.2f}s, {:.0f} objects/s".format(
+                name, count, elapsed, count / elapsed))
+    base_model.strptime = fast
@@ -11,6 +11,9 @@ storage_t = getenv("HBNB_TYPE_STORAGE")
 if storage_t == "db":
     from models.engine.db_storage import DBStorage
     storage = DBStorage()
+elif storage_t == "column":
+    from models.engine.column_storage import ColumnStorage
+    storage = ColumnStorage()
 else:
     from models.engine.file_storage import FileStorage
     storage = FileStorage()
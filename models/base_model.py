@@ -4,27 +4,62 @@ Contains class BaseModel
 """
 
 from datetime import datetime
+from functools import lru_cache
 import models
 from os import getenv
+import re
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects.mysql import DATETIME
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 
 time = "%Y-%m-%dT%H:%M:%S.%f"
+# the strings isoformat() writes, which all match time
+isoformatted = re.compile(r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\.\d{6}", re.ASCII)
 
 if models.storage_t == "db":
     Base = declarative_base()
 else:
     Base = object
 
+# datetime column keeping microseconds in MySQL, whose DATETIME drops them
+Timestamp = DateTime().with_variant(DATETIME(fsp=6), "mysql")
+
+
+@lru_cache(maxsize=65536)
+def isoformat(value):
+    """returns the datetime value formatted with time, cached by value"""
+    return value.isoformat(timespec="microseconds")
+
+
+def strptime(value):
+    """returns the datetime written in value with the format time
+
+    datetime.fromisoformat() parses that format several times faster than
+    datetime.strptime(), but also accepts looser ISO 8601 strings, so it
+    only gets the values written exactly as isoformat() writes them.
+    """
+    if type(value) is str and isoformatted.fullmatch(value):
+        return datetime.fromisoformat(value)
+    return datetime.strptime(value, time)
+
+
+@lru_cache(maxsize=None)
+def hidden_keys(cls):
+    """returns the attributes of cls instances that to_dict leaves out"""
+    if hasattr(cls, "__mapper__"):
+        return ("_sa_instance_state",) + tuple(
+            cls.__mapper__.relationships.keys())
+    return ("_sa_instance_state",)
+
 
 class BaseModel:
     """The BaseModel class from which future classes will be derived"""
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
-        created_at = Column(DateTime, default=datetime.utcnow)
-        updated_at = Column(DateTime, default=datetime.utcnow)
+        created_at = Column(Timestamp, default=datetime.utcnow, index=True)
+        updated_at = Column(Timestamp, default=datetime.utcnow)
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
@@ -33,11 +68,14 @@ class BaseModel:
                 if key != "__class__":
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
-                self.created_at = datetime.strptime(kwargs["created_at"], time)
+                self.created_at = strptime(kwargs["created_at"])
             else:
                 self.created_at = datetime.utcnow()
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
-                self.updated_at = datetime.strptime(kwargs["updated_at"], time)
+                if kwargs["updated_at"] == kwargs.get("created_at"):
+                    self.updated_at = self.created_at
+                else:
+                    self.updated_at = strptime(kwargs["updated_at"])
             else:
                 self.updated_at = datetime.utcnow()
             if kwargs.get("id", None) is None:
@@ -62,12 +100,12 @@ class BaseModel:
         """returns a dictionary containing all keys/values of the instance"""
         new_dict = self.__dict__.copy()
         if "created_at" in new_dict:
-            new_dict["created_at"] = new_dict["created_at"].strftime(time)
+            new_dict["created_at"] = isoformat(new_dict["created_at"])
         if "updated_at" in new_dict:
-            new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
+            new_dict["updated_at"] = isoformat(new_dict["updated_at"])
         new_dict["__class__"] = self.__class__.__name__
-        if "_sa_instance_state" in new_dict:
-            del new_dict["_sa_instance_state"]
+        for key in hidden_keys(self.__class__):
+            new_dict.pop(key, None)
         return new_dict
 
     def delete(self):
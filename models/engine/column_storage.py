@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+Contains the ColumnStorage class
+"""
+
+from array import array
+from models.engine.file_storage import FileStorage
+from models.place import distance, in_box
+
+
+class ColumnStorage(FileStorage):
+    """FileStorage that also keeps the numeric attributes of each class as
+    typed columns, so range filters scan arrays instead of objects"""
+
+    # dictionary - numeric attributes stored as columns, by <class name>
+    __schema = {"Place": ("number_rooms", "number_bathrooms", "max_guest",
+                          "price_by_night", "latitude", "longitude")}
+    # dictionary - object of every row, by <class name>
+    __rows = {}
+    # dictionary - row of every key
+    __row_of = {}
+    # dictionary - array of doubles for every attribute, by <class name>
+    __columns = {}
+
+    @staticmethod
+    def __double(value):
+        """returns value as a float for the columns, nan if it is not a
+        number"""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return float("nan")
+
+    def __table(self, name):
+        """returns the columns of class name, building them if needed"""
+        if name not in self.__columns:
+            attrs = self.__schema[name]
+            rows = self.all(name)
+            self.__rows[name] = list(rows.values())
+            for row, key in enumerate(rows):
+                self.__row_of[key] = row
+            self.__columns[name] = {
+                attr: array('d', (self.__double(getattr(obj, attr, None))
+                                  for obj in self.__rows[name]))
+                for attr in attrs}
+        return self.__columns[name]
+
+    def __store(self, key, obj):
+        """writes the attributes of obj to the row of key"""
+        name = key.split('.', 1)[0]
+        columns = self.__columns[name]
+        row = self.__row_of.get(key)
+        if row is None:
+            row = self.__row_of[key] = len(self.__rows[name])
+            self.__rows[name].append(obj)
+            for column in columns.values():
+                column.append(0.0)
+        self.__rows[name][row] = obj
+        for attr, column in columns.items():
+            column[row] = self.__double(getattr(obj, attr, None))
+
+    def __drop(self, key):
+        """removes the row of key, moving the last row in its place"""
+        name = key.split('.', 1)[0]
+        row = self.__row_of.pop(key, None)
+        if row is None:
+            return
+        rows = self.__rows[name]
+        last = rows.pop()
+        for column in self.__columns[name].values():
+            value = column.pop()
+            if row < len(rows):
+                column[row] = value
+        if row < len(rows):
+            rows[row] = last
+            self.__row_of[name + '.' + last.id] = row
+
+    def new(self, obj):
+        """sets in __objects the obj with key <obj class name>.id"""
+        super().new(obj)
+        name = obj.__class__.__name__
+        if name in self.__columns:
+            self.__store(name + '.' + obj.id, obj)
+
+    def delete(self, obj=None):
+        """delete obj from __objects if it’s inside"""
+        super().delete(obj)
+        if obj is not None and obj.__class__.__name__ in self.__columns:
+            self.__drop(obj.__class__.__name__ + '.' + obj.id)
+
+    def reload(self):
+        """deserializes the JSON file to __objects, dropping the columns"""
+        super().reload()
+        for index in (self.__rows, self.__row_of, self.__columns):
+            index.clear()
+
+    def __scan(self, ranges, box, near):
+        """returns the keys of the places whose columns are within ranges,
+        box and near, narrowing the rows one column at a time"""
+        columns = self.__table("Place")
+        rows = range(len(self.__rows["Place"]))
+        for attr, (low, high) in ranges.items():
+            column = columns[attr]
+            low = float("-inf") if low is None else float(low)
+            high = float("inf") if high is None else float(high)
+            rows = [row for row in rows if low <= column[row] <= high]
+        latitudes, longitudes = columns["latitude"], columns["longitude"]
+        if box is not None or near is not None:
+            rows = [row for row in rows if latitudes[row] == latitudes[row] and
+                    longitudes[row] == longitudes[row]]
+        if box is not None:
+            rows = [row for row in rows
+                    if in_box(latitudes[row], longitudes[row], box)]
+        if near is not None:
+            latitude, longitude, radius = near
+            rows = [row for row in rows
+                    if distance(latitudes[row], longitudes[row],
+                                latitude, longitude) <= radius]
+        return {"Place." + self.__rows["Place"][row].id for row in rows}
+
+    def places_in(self, states=(), cities=(), amenities=(), limit=None,
+                  after=None, ranges=None, box=None, near=None, text=None,
+                  among=None):
+        """returns the places FileStorage.places_in() does
+
+        Ranges over the Place columns, box and near are one scan of the
+        columns, which are built the first time and follow new() and
+        delete() from then on, so they reflect every place as of its last
+        save().
+        """
+        ranges = dict(ranges or {})
+        scanned = {attr: ranges.pop(attr) for attr in list(ranges)
+                   if attr in self.__schema["Place"]}
+        if scanned or box is not None or near is not None:
+            keys = self.__scan(scanned, box, near)
+            among = keys if among is None else keys & set(among)
+        return super().places_in(states, cities, amenities, limit, after,
+                                 ranges, None, None, text, among)
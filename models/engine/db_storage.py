@@ -5,29 +5,120 @@ Contains the class DBStorage
 
 import models
 from models.amenity import Amenity
-from models.base_model import BaseModel, Base
+from models.base_model import BaseModel, Base, isoformat, strptime
 from models.city import City
-from models.place import Place
+from models.place import EARTH_RADIUS, Place, bounding_box, words
 from models.review import Review
 from models.state import State
 from models.user import User
+from math import cos, radians
 from os import getenv
 import sqlalchemy
-from sqlalchemy import create_engine
-from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import and_, create_engine, distinct, func, or_, select
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.orm import scoped_session, selectinload, sessionmaker
+from sqlalchemy.pool import QueuePool
+from threading import Lock
+from time import perf_counter
+from uuid import uuid4
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
 
 
-Base = declarative_base()
+def flag(name):
+    """returns the boolean set in the environment variable name: 1, true,
+    yes or on, or 0, false, no, off or nothing (the default)"""
+    value = getenv(name, "").strip().lower()
+    if value in ("1", "true", "yes", "on"):
+        return True
+    if value in ("", "0", "false", "no", "off"):
+        return False
+    raise ValueError("{} is not a boolean: {}".format(name, value))
+
+
+class InstrumentedPool(QueuePool):
+    """QueuePool counting checkouts, the ones that had to wait for a
+    connection to be returned, and how long they took"""
+
+    # seconds - upper bounds of the checkout latency histogram buckets
+    buckets = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, float("inf"))
+
+    def __init__(self, *args, **kwargs):
+        """Creates the pool and zeroes its counters"""
+        super().__init__(*args, **kwargs)
+        self.__lock = Lock()
+        self.__max_overflow = kwargs.get("max_overflow", 10)
+        self.__recycle = kwargs.get("recycle", -1)
+        self.__pre_ping = kwargs.get("pre_ping", False)
+        self.__checkouts = 0
+        self.__waits = 0
+        self.__timeouts = 0
+        self.__latency = [0] * len(self.buckets)
+        self.__latency_sum = 0.0
+
+    def connect(self):
+        """checks a connection out, timing it"""
+        exhausted = (self.__max_overflow >= 0 and self.checkedout() >=
+                     self.size() + self.__max_overflow)
+        start = perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeout:
+            with self.__lock:
+                self.__timeouts += 1
+            raise
+        finally:
+            elapsed = perf_counter() - start
+            with self.__lock:
+                self.__checkouts += 1
+                self.__waits += exhausted
+                self.__latency_sum += elapsed
+                for i, bound in enumerate(self.buckets):
+                    if elapsed <= bound:
+                        self.__latency[i] += 1
+                        break
+
+    def stats(self):
+        """returns the state and counters of the pool"""
+        with self.__lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.buckets, self.__latency):
+                cumulative += count
+                buckets["+Inf" if bound == float("inf") else
+                        str(bound)] = cumulative
+            return {"pool_size": self.size(),
+                    "max_overflow": self.__max_overflow,
+                    "timeout": self.timeout(),
+                    "recycle": self.__recycle,
+                    "pre_ping": self.__pre_ping,
+                    "checked_out": self.checkedout(),
+                    "checked_in": self.checkedin(),
+                    "overflow": max(0, self.overflow()),
+                    "checkouts": self.__checkouts,
+                    "waits": self.__waits,
+                    "timeouts": self.__timeouts,
+                    "checkout_seconds": {"buckets": buckets,
+                                         "count": self.__checkouts,
+                                         "sum": self.__latency_sum}}
 
 
 class DBStorage:
     """interacts with the MySQL database"""
     __engine = None
     __session = None
+    __listeners = None
+    __touched = None
+    # string - differs for every storage, so versions handed out before a
+    # restart never match
+    __nonce = None
+    # dictionary - <class name>: number of changes made through the storage
+    __versions = None
+    # integer - number of reloads, each of which may change any class
+    __epoch = 0
+    # integer - rows read at a time by iter_all() and iter_places_in()
+    __batch = 1000
 
     def __init__(self):
         """Instantiate a DBStorage object"""
@@ -36,13 +127,27 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
+        self.__listeners = []
+        self.__touched = set()
+        self.__nonce = uuid4().hex[:8]
+        self.__versions = {}
 
         self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
                                       format(HBNB_MYSQL_USER,
                                              HBNB_MYSQL_PWD,
                                              HBNB_MYSQL_HOST,
                                              HBNB_MYSQL_DB),
-                                      pool_size=10, max_overflow=20)
+                                      poolclass=InstrumentedPool,
+                                      pool_size=int(getenv(
+                                          'HBNB_MYSQL_POOL_SIZE', 10)),
+                                      max_overflow=int(getenv(
+                                          'HBNB_MYSQL_MAX_OVERFLOW', 20)),
+                                      pool_timeout=float(getenv(
+                                          'HBNB_MYSQL_POOL_TIMEOUT', 30)),
+                                      pool_recycle=int(getenv(
+                                          'HBNB_MYSQL_POOL_RECYCLE', -1)),
+                                      pool_pre_ping=flag(
+                                          'HBNB_MYSQL_POOL_PRE_PING'))
 
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
@@ -58,41 +163,255 @@ class DBStorage:
                     new_dict[key] = obj
         return (new_dict)
 
+    def iter_all(self, cls):
+        """yields the objects of cls, a class or a class name, ordered by
+        (created_at, id) and read __batch rows at a time"""
+        if isinstance(cls, str):
+            cls = classes[cls]
+        return self.__batches(self.__session.query(cls), cls)
+
+    def __batches(self, query, cls):
+        """yields the objects of query, ordered by (created_at, id)
+
+        Rows are read __batch at a time, each batch with its own keyset
+        query, so no cursor stays open between them and only the objects
+        of the current batch are held.
+        """
+        after = None
+        while True:
+            objs = self.__page(query, cls, self.__batch, after).all()
+            yield from objs
+            if len(objs) < self.__batch:
+                return
+            after = (isoformat(objs[-1].created_at), objs[-1].id)
+
     def new(self, obj):
         """add the object to the current database session"""
         self.__session.add(obj)
+        self.__touched.add(obj.__class__.__name__)
+        self.__notify(obj.__class__.__name__)
 
     def save(self):
         """commit all changes of the current database session"""
+        names = self.__touched | {obj.__class__.__name__ for obj in
+                                  self.__session.dirty}
+        self.__touched.clear()
         self.__session.commit()
+        for name in names:
+            self.__notify(name)
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
             self.__session.delete(obj)
+            self.__touched.add(obj.__class__.__name__)
+            self.__notify(obj.__class__.__name__)
 
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
         sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
         self.__session = scoped_session(sess_factory)
+        self.__notify(None)
 
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
+    def subscribe(self, listener):
+        """calls listener(name) whenever rows of class name are changed by
+        new(), delete() or save(), and listener(None) on reload()"""
+        self.__listeners.append(listener)
+
+    def __notify(self, name):
+        """counts a change of the rows of class name, or of any row if name
+        is None, and calls every listener with name"""
+        if name is None:
+            self.__epoch += 1
+        else:
+            self.__versions[name] = self.__versions.get(name, 0) + 1
+        for listener in self.__listeners:
+            listener(name)
+
+    def pool_stats(self):
+        """returns the state and counters of the connection pool"""
+        return self.__engine.pool.stats()
+
     def get(self, cls, id):
         """retrieves data"""
         if cls in classes.values() and id and isinstance(id, str):
-            d_obj = self.all(cls)
-            for value in d_obj.values():
-                if value.id == id:
-                    return value
+            return self.__session.get(cls, id)
         return None
 
     def count(self, cls=None):
         """counts number of objects in storage."""
-        data = self.all(cls)
-        if cls in classes.values():
-            data = self.all(cls)
-        return len(data)
+        if cls is None:
+            return sum(self.counts().values())
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+        if cls not in classes.values():
+            return 0
+        return self.__session.query(func.count(cls.id)).scalar()
+
+    def counts(self):
+        """returns the number of rows of every class in one round trip"""
+        columns = [select(func.count()).select_from(classes[clss])
+                   .scalar_subquery().label(clss) for clss in classes]
+        row = self.__session.query(*columns).one()
+        return {clss: row[i] for i, clss in enumerate(classes)}
+
+    def version(self, cls=None):
+        """returns a string that changes whenever the rows of cls, or any
+        row if cls is None, change
+
+        It is made of counters bumped by new(), delete(), save() and
+        reload(), so it costs no query; rows changed by other processes
+        do not change it.
+        """
+        if cls is None:
+            changes = sum(self.__versions.values())
+        else:
+            name = cls if isinstance(cls, str) else cls.__name__
+            changes = self.__versions.get(name, 0)
+        return "{}-{}-{}".format(self.__nonce, self.__epoch, changes)
+
+    def places_in(self, states=(), cities=(), amenities=(), limit=None,
+                  after=None, ranges=None, box=None, near=None, text=None):
+        """returns the places of the given states and cities, or all places,
+        that have every amenity of amenities and whose attributes are
+        within ranges, a dictionary of (low, high) by attribute
+
+        box (south, west, north, east) and near (latitude, longitude,
+        radius in kilometers) keep the places located in them. text keeps
+        the places whose name and description, or one of whose reviews,
+        have a word starting with each of its words.
+
+        The filters compile into a single SELECT: a join on cities for the
+        states and cities, a place_amenity subquery grouped by place
+        keeping places that match as many amenities as were asked for, and
+        a condition on the indexed column of each range. Areas are first
+        narrowed down to their bounding box on the (latitude, longitude)
+        index, then near is checked with the haversine formula. text is
+        matched against the FULLTEXT indexes of places and reviews.
+        The amenities of the result are loaded with one extra SELECT ... IN.
+        With limit or after, the result is paged like page() does.
+        """
+        query = self.__places(states, cities, amenities, ranges, box, near,
+                              text)
+        if limit is not None or after is not None:
+            query = self.__page(query, Place, limit, after)
+        return query.all()
+
+    def iter_places_in(self, states=(), cities=(), amenities=(), ranges=None,
+                       box=None, near=None, text=None):
+        """yields the places places_in() returns, ordered by (created_at, id)
+        and read __batch rows at a time"""
+        return self.__batches(self.__places(states, cities, amenities,
+                                            ranges, box, near, text), Place)
+
+    def __places(self, states, cities, amenities, ranges, box, near, text):
+        """returns the query of the places matching the filters of
+        places_in()"""
+        query = self.__session.query(Place).options(
+            selectinload(Place.amenities))
+        if states or cities:
+            query = query.join(City, Place.city_id == City.id).filter(
+                or_(City.state_id.in_(states), Place.city_id.in_(cities)))
+        if amenities:
+            amenities = set(amenities)
+            place_amenity = Base.metadata.tables['place_amenity']
+            having_all = select(place_amenity.c.place_id).where(
+                place_amenity.c.amenity_id.in_(amenities)).group_by(
+                place_amenity.c.place_id).having(
+                func.count(distinct(place_amenity.c.amenity_id)) ==
+                len(amenities))
+            query = query.filter(Place.id.in_(having_all))
+        for attr, (low, high) in (ranges or {}).items():
+            query = self.__between(query, getattr(Place, attr), low, high)
+        if box is not None:
+            query = self.__inside(query, box)
+        if near is not None:
+            latitude, longitude, radius = near
+            query = self.__inside(query, bounding_box(*near)).filter(
+                self.__distance(latitude, longitude) <= radius)
+        terms = words(text) if text else []
+        if terms:
+            query = query.filter(or_(
+                self.__matches(terms, Place.name, Place.description),
+                Place.id.in_(select(Review.place_id).where(
+                    self.__matches(terms, Review.text)))))
+        return query
+
+    def range(self, cls, attr, low=None, high=None):
+        """returns the objects of cls with low <= attr <= high
+
+        Either bound may be None.
+        """
+        if isinstance(cls, str):
+            cls = classes.get(cls)
+            if cls is None:
+                return []
+        query = self.__session.query(cls)
+        return self.__between(query, getattr(cls, attr), low, high).all()
+
+    def __between(self, query, column, low, high):
+        """keeps the rows of query with low <= column <= high"""
+        if low is not None:
+            query = query.filter(column >= low)
+        if high is not None:
+            query = query.filter(column <= high)
+        return query
+
+    def __inside(self, query, box):
+        """keeps the places of query in box (south, west, north, east)"""
+        south, west, north, east = box
+        query = query.filter(Place.latitude.between(south, north))
+        if west <= east:
+            return query.filter(Place.longitude.between(west, east))
+        return query.filter(or_(Place.longitude >= west,
+                                Place.longitude <= east))
+
+    def __matches(self, terms, *columns):
+        """returns the SQL condition that columns have a word starting
+        with each term
+
+        MySQL uses the FULLTEXT index of columns in boolean mode, other
+        databases fall back to LIKE.
+        """
+        if self.__engine.dialect.name == 'mysql':
+            against = " ".join("+" + term + "*" for term in terms)
+            return match(*columns, against=against).in_boolean_mode()
+        return and_(*(or_(*(column.ilike("%" + term + "%")
+                            for column in columns)) for term in terms))
+
+    def __distance(self, latitude, longitude):
+        """returns the SQL expression of the distance in kilometers of a
+        place to (latitude, longitude)"""
+        half_dlat = func.radians(Place.latitude - latitude) / 2
+        half_dlon = func.radians(Place.longitude - longitude) / 2
+        a = (func.power(func.sin(half_dlat), 2) + cos(radians(latitude)) *
+             func.cos(func.radians(Place.latitude)) *
+             func.power(func.sin(half_dlon), 2))
+        return 2 * EARTH_RADIUS * func.asin(func.sqrt(a))
+
+    def page(self, cls, limit=None, after=None):
+        """returns the objects of cls ordered by (created_at, id)
+
+        Only the limit first objects (all if None) that sort after the
+        (created_at, id) pair after are returned, using a keyset
+        condition rather than an OFFSET.
+        """
+        query = self.__session.query(cls)
+        return self.__page(query, cls, limit, after).all()
+
+    def __page(self, query, cls, limit, after):
+        """orders query by (created_at, id) and keeps the page asked for"""
+        query = query.order_by(cls.created_at, cls.id)
+        if after is not None:
+            created_at = strptime(after[0])
+            query = query.filter(or_(
+                cls.created_at > created_at,
+                and_(cls.created_at == created_at, cls.id > after[1])))
+        if limit is not None:
+            query = query.limit(limit)
+        return query
@@ -3,16 +3,25 @@
 Contains the FileStorage class
 """
 
+from bisect import bisect_left, bisect_right, insort
+from contextlib import contextmanager
+from fcntl import LOCK_EX, LOCK_UN, flock
 import json
 import models
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, isoformat
 from models.city import City
-from models.place import Place
+from models.place import Place, bounding_box, distance, in_box, words
 from models.review import Review
 from models.state import State
 from models.user import User
-from hashlib import md5
+from hashlib import md5, sha256
+from math import floor
+from os import chmod, fdopen, fsync, getenv, path, remove, replace, stat
+from sys import intern
+from tempfile import mkstemp
+from threading import local
+from uuid import uuid4
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -25,62 +34,949 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects bucketed by <class name>
+    __by_class = {}
+    # the __objects dictionary __by_class was built from
+    __indexed = None
+    # boolean - append changes to __file_path.journal instead of rewriting
+    __journal = bool(getenv("HBNB_FILE_JOURNAL"))
+    # integer - journal records after which save() rewrites the snapshot
+    __compact_at = int(getenv("HBNB_FILE_JOURNAL_COMPACT", 1000))
+    # integer - number of records currently in the journal
+    __journaled = 0
+    # dictionary - objects changed since the last save, None when deleted
+    __dirty = {}
+    # boolean - prefix the JSON file with a sha256 checksum header
+    __checksum = bool(getenv("HBNB_FILE_CHECKSUM"))
+    # tuple - stat of the files as last read or written by this process
+    __signature = None
+    # thread-local - lock file held by the current thread, if any
+    __held = local()
+    # boolean - keep reloaded objects as dicts until they are accessed
+    __lazy = bool(getenv("HBNB_FILE_LAZY"))
+    # dictionary - dicts not instantiated yet, by <class name> then key
+    __pending = {}
+    # boolean - intern the ids of other objects held by reloaded dicts
+    __interned = bool(getenv("HBNB_FILE_INTERN"))
+    # tuple - attributes holding the id of another object
+    __shared_ids = ("state_id", "city_id", "place_id", "user_id")
+    # dictionary - attribute holding the parent id, by <class name>
+    __foreign_keys = {"City": "state_id", "Place": "city_id",
+                      "Review": "place_id"}
+    # dictionary - child keys (as dict keys) by (<class name>, parent id)
+    __children = {}
+    # dictionary - parent id every child key is indexed under
+    __parents = {}
+    # dictionary - place keys (as dict keys) by amenity id
+    __places_with = {}
+    # dictionary - frozenset of amenity ids every place key is indexed under
+    __amenities_of = {}
+    # dictionary - sorted lists of (created_at, id) by <class name>, built
+    # the first time the class is paged through
+    __sorted = {}
+    # dictionary - (created_at, id) every sorted key is sorted under
+    __sort_keys = {}
+    # dictionary - sorted lists of (value, key) by (<class name>, attribute),
+    # built the first time objects are filtered on the attribute
+    __ranked = {}
+    # dictionary - (value, key) every ranked key is ranked under, by
+    # (key, attribute)
+    __ranks = {}
+    # float - size in degrees of the cells of the latitude/longitude grid
+    __cell_size = 0.1
+    # dictionary - place keys (as dict keys) by (row, column) grid cell,
+    # built the first time places are looked up by location
+    __grid = {}
+    # boolean - whether __grid is built
+    __gridded = False
+    # dictionary - grid cell every place key is indexed in
+    __cells = {}
+    # dictionary - place and review keys (as dict keys) by word of the
+    # place name and description or the review text, built the first time
+    # places are searched
+    __postings = {}
+    # list - sorted words of __postings, to look words up by prefix
+    __vocabulary = []
+    # boolean - whether __postings is built
+    __worded = False
+    # dictionary - (place key, words) every place and review key is
+    # indexed under
+    __words_of = {}
+    # string - differs every time the process starts, so versions handed
+    # out by different processes never collide
+    __nonce = uuid4().hex[:8]
+    # dictionary - number of changes made by new() and delete(), by
+    # <class name>
+    __versions = {}
+    # integer - number of times every class may have changed at once, by
+    # a reload or __objects being replaced
+    __epoch = 0
+    # list - callables notified with the class name of objects changed by
+    # new(), delete() or save(), or None when any may have been reloaded
+    __listeners = []
+
+    def __buckets(self):
+        """returns the per-class index, rebuilding it if __objects changed"""
+        if FileStorage.__indexed is not self.__objects:
+            FileStorage.__by_class = {}
+            for index in (self.__children, self.__parents,
+                          self.__places_with, self.__amenities_of,
+                          self.__sorted, self.__sort_keys,
+                          self.__ranked, self.__ranks,
+                          self.__grid, self.__cells,
+                          self.__postings, self.__words_of):
+                index.clear()
+            for key, value in self.__objects.items():
+                name = key.split('.', 1)[0]
+                self.__by_class.setdefault(name, {})[key] = value
+                self.__index(key, value)
+            for pending in self.__pending.values():
+                for key, value in pending.items():
+                    self.__index(key, value)
+            FileStorage.__gridded = False
+            FileStorage.__worded = False
+            del self.__vocabulary[:]
+            FileStorage.__epoch += 1
+            FileStorage.__indexed = self.__objects
+        return self.__by_class
+
+    def __index(self, key, obj):
+        """indexes the foreign keys of obj, an object or a dict from disk"""
+        def field(attr):
+            """returns the attribute attr of obj, None if it has none"""
+            if isinstance(obj, dict):
+                return obj.get(attr)
+            return getattr(obj, attr, None)
+
+        name = key.split('.', 1)[0]
+        if name in self.__foreign_keys:
+            self.__link(key, field(self.__foreign_keys[name]))
+        if name == "Place":
+            self.__tag(key, field("amenity_ids") or ())
+        if name in self.__sorted:
+            self.__order(key, obj)
+        for ranked, attr in self.__ranked:
+            if ranked == name:
+                self.__rank(key, attr, field(attr))
+        if name == "Place" and self.__gridded:
+            self.__locate(key, field("latitude"), field("longitude"))
+        if self.__worded:
+            self.__read(key, field)
+
+    def __unindex(self, key):
+        """removes key from the foreign key indexes"""
+        name = key.split('.', 1)[0]
+        self.__link(key, None)
+        self.__tag(key, ())
+        if name in self.__sorted:
+            self.__order(key, None)
+        for ranked, attr in self.__ranked:
+            if ranked == name:
+                self.__rank(key, attr, None)
+        if name == "Place" and self.__gridded:
+            self.__locate(key, None, None)
+        if self.__worded:
+            self.__read(key, None)
+
+    @staticmethod
+    def __number(value):
+        """returns value as a float, None if it is not a number"""
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return None
+        return value if value == value else None
+
+    def __rank(self, key, attr, value):
+        """moves key to where value sorts among the attr of its class, or
+        drops it if value is not a number"""
+        ranked = self.__ranked[(key.split('.', 1)[0], attr)]
+        old = self.__ranks.pop((key, attr), None)
+        value = self.__number(value)
+        new = (value, key) if value is not None else None
+        if old is not None:
+            del ranked[bisect_left(ranked, old)]
+        if new is not None:
+            insort(ranked, new)
+            self.__ranks[(key, attr)] = new
+
+    def __ranking(self, name, attr):
+        """returns the sorted list of (attr, key) of class name"""
+        self.__buckets()
+        if (name, attr) not in self.__ranked:
+            values = {}
+            for key, obj in self.__by_class.get(name, {}).items():
+                values[key] = self.__number(getattr(obj, attr, None))
+            for key, value in self.__pending.get(name, {}).items():
+                values[key] = self.__number(value.get(attr))
+            entries = {}
+            for key, value in values.items():
+                if value is not None:
+                    entries[(key, attr)] = (value, key)
+            self.__ranks.update(entries)
+            self.__ranked[(name, attr)] = sorted(entries.values())
+        return self.__ranked[(name, attr)]
+
+    def __between(self, name, attr, low=None, high=None):
+        """returns the keys of class name with low <= attr <= high"""
+        ranked = self.__ranking(name, attr)
+        start = 0 if low is None else bisect_left(ranked, (float(low),))
+        end = len(ranked)
+        if high is not None:
+            # every key sorts before the highest code point
+            end = bisect_right(ranked, (float(high), chr(0x10ffff)))
+        return [key for value, key in ranked[start:end]]
+
+    @staticmethod
+    def __sort_key(obj):
+        """returns the (created_at, id) pair obj is paged by"""
+        if isinstance(obj, dict):
+            return (obj.get("created_at", ""), obj.get("id"))
+        created_at = obj.created_at
+        if not isinstance(created_at, str):
+            created_at = isoformat(created_at)
+        return (created_at, obj.id)
+
+    def __order(self, key, obj):
+        """moves key to where obj sorts in its class, or drops it if None"""
+        ordered = self.__sorted[key.split('.', 1)[0]]
+        old = self.__sort_keys.pop(key, None)
+        new = self.__sort_key(obj) if obj is not None else None
+        if old == new:
+            if new is not None:
+                self.__sort_keys[key] = new
+            return
+        if old is not None:
+            del ordered[bisect_left(ordered, old)]
+        if new is not None:
+            insort(ordered, new)
+            self.__sort_keys[key] = new
+
+    def __ordered(self, name):
+        """returns the sorted list of (created_at, id) of class name"""
+        self.__buckets()
+        if name not in self.__sorted:
+            entries = {}
+            for key, obj in self.__by_class.get(name, {}).items():
+                entries[key] = self.__sort_key(obj)
+            for key, value in self.__pending.get(name, {}).items():
+                entries[key] = self.__sort_key(value)
+            self.__sort_keys.update(entries)
+            self.__sorted[name] = sorted(entries.values())
+        return self.__sorted[name]
+
+    def __tag(self, key, amenity_ids):
+        """indexes the place key under each id of amenity_ids"""
+        old = self.__amenities_of.pop(key, frozenset())
+        new = frozenset(amenity_ids)
+        for amenity_id in old - new:
+            places = self.__places_with[amenity_id]
+            del places[key]
+            if not places:
+                del self.__places_with[amenity_id]
+        for amenity_id in new - old:
+            self.__places_with.setdefault(amenity_id, {})[key] = None
+        if new:
+            self.__amenities_of[key] = new
+
+    def __link(self, key, parent_id):
+        """indexes key as a child of parent_id, or nothing if it is None"""
+        name = key.split('.', 1)[0]
+        old = self.__parents.pop(key, None)
+        if old is not None:
+            siblings = self.__children[(name, old)]
+            del siblings[key]
+            if not siblings:
+                del self.__children[(name, old)]
+        if parent_id is not None:
+            self.__parents[key] = parent_id
+            self.__children.setdefault((name, parent_id), {})[key] = None
+
+    def __add(self, key, obj):
+        """stores obj under key in __objects and the per-class index, in
+        place of the dict of key still pending if any"""
+        buckets = self.__buckets()
+        name = key.split('.', 1)[0]
+        self.__pending.get(name, {}).pop(key, None)
+        self.__objects[key] = obj
+        buckets.setdefault(name, {})[key] = obj
+        self.__index(key, obj)
+
+    def __remove(self, key):
+        """removes key from __objects and the per-class index"""
+        buckets = self.__buckets()
+        name = key.split('.', 1)[0]
+        self.__objects.pop(key, None)
+        buckets.get(name, {}).pop(key, None)
+        self.__pending.get(name, {}).pop(key, None)
+        self.__unindex(key)
+
+    def __object(self, key):
+        """returns the object stored under key, instantiating it if needed"""
+        name = key.split('.', 1)[0]
+        value = self.__pending.get(name, {}).pop(key, None)
+        if value is not None:
+            self.__add(key, classes[name](**value))
+        return self.__objects.get(key)
+
+    def __share(self, value):
+        """interns the ids of other objects held by the dict value
+
+        The same state_id, city_id, place_id, user_id or amenity id is read
+        once per object referencing it; interning makes them all point to
+        one string.
+        """
+        for attr in self.__shared_ids:
+            if type(value.get(attr)) is str:
+                value[attr] = intern(value[attr])
+        if type(value.get("amenity_ids")) is list:
+            value["amenity_ids"] = [intern(item) if type(item) is str
+                                    else item
+                                    for item in value["amenity_ids"]]
+
+    def __load(self, key, value):
+        """stores the dict value read from disk under key
+
+        In lazy mode the dict is kept as is until the object is accessed,
+        otherwise it is instantiated right away.
+        """
+        if self.__interned:
+            self.__share(value)
+        if self.__lazy:
+            name = key.split('.', 1)[0]
+            self.__remove(key)
+            self.__pending.setdefault(name, {})[key] = value
+            self.__index(key, value)
+        else:
+            self.__add(key, classes[value["__class__"]](**value))
+
+    def __hydrate(self, name=None):
+        """instantiates the pending dicts of class name, or of every class"""
+        names = list(self.__pending) if name is None else [name]
+        for name in names:
+            for key, value in self.__pending.pop(name, {}).items():
+                self.__add(key, classes[value["__class__"]](**value))
+
+    def __names(self, cls):
+        """returns the class names whose objects are instances of cls, a
+        class or a class name"""
+        if isinstance(cls, str):
+            return [cls]
+        names = [name for name in classes if issubclass(classes[name], cls)]
+        for name, bucket in self.__buckets().items():
+            if name not in classes and any(isinstance(obj, cls)
+                                           for obj in bucket.values()):
+                names.append(name)
+        return names
 
     def all(self, cls=None):
-        """returns the dictionary __objects"""
+        """returns the dictionary __objects, or the objects that are
+        instances of cls (subclasses included) or whose class is named cls
+        """
         if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if isinstance(value, cls):
-                    new_dict[key] = value
-            return new_dict
+            objs = {}
+            for name in self.__names(cls):
+                if name in self.__pending:
+                    self.__hydrate(name)
+                objs.update(self.__buckets().get(name, {}))
+            return objs
+        if self.__pending:
+            self.__hydrate()
         return self.__objects
 
+    def iter_all(self, cls):
+        """yields the objects all(cls) returns, instantiating the dicts
+        still pending one at a time as they are reached"""
+        keys = []
+        for name in self.__names(cls):
+            keys.extend(self.__buckets().get(name, {}))
+            keys.extend(self.__pending.get(name, {}))
+        for key in keys:
+            obj = self.__object(key)
+            if obj is not None:
+                yield obj
+
+    def iter_places_in(self, states=(), cities=(), amenities=(), ranges=None,
+                       box=None, near=None, text=None):
+        """yields the places places_in() returns"""
+        return iter(self.places_in(states, cities, amenities, None, None,
+                                   ranges, box, near, text))
+
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
-        self.__objects.update({obj.to_dict()['__class__'] + '.' + obj.id: obj})
+        key = obj.__class__.__name__ + '.' + obj.id
+        self.__add(key, obj)
+        self.__changed(obj.__class__.__name__)
+        self.__notify(obj.__class__.__name__)
+        self.__dirty[key] = obj
+
+    @contextmanager
+    def __locked(self):
+        """holds an exclusive lock on __file_path.lock, so processes
+        sharing the files read and write them one at a time"""
+        if getattr(self.__held, "file", None) is not None:
+            yield
+            return
+        with open(self.__file_path + ".lock", 'a') as f:
+            flock(f.fileno(), LOCK_EX)
+            self.__held.file = f
+            try:
+                yield
+            finally:
+                self.__held.file = None
+                flock(f.fileno(), LOCK_UN)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
+        """serializes __objects to the JSON file (path: __file_path)
+
+        If another process wrote the files since this one last read them,
+        they are reloaded first and the changes of this process applied on
+        top, so neither overwrites the other.
+        """
+        names = {key.split('.', 1)[0] for key in self.__dirty}
+        with self.__locked():
+            if self.__stat() != self.__signature:
+                self.reload()
+            if (not self.__journal or self.__journaled +
+                    len(self.__dirty) >= self.__compact_at):
+                self.__snapshot()
+            elif self.__dirty:
+                self.__append()
+            self.__dirty.clear()
+        for name in names:
+            self.__notify(name)
+
+    def __snapshot(self):
+        """rewrites the whole JSON file and empties the journal
+
+        The snapshot is written to a temporary file next to __file_path,
+        synced to disk and renamed over it, so readers never see a
+        partially written file.
+        """
         json_objects = {}
+        for pending in self.__pending.values():
+            json_objects.update(pending)
         for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict(False)
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
+            json_objects[key] = self.__objects[key].to_dict()
+        try:
+            mode = stat(self.__file_path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        fd, tmp_path = mkstemp(prefix=".file.json.",
+                               dir=path.dirname(path.abspath(
+                                   self.__file_path)))
+        try:
+            with fdopen(fd, 'w') as f:
+                if self.__checksum:
+                    f.write("#sha256 " + "0" * 64 + "\n")
+                digest = sha256()
+                for chunk in json.JSONEncoder().iterencode(json_objects):
+                    f.write(chunk)
+                    digest.update(chunk.encode())
+                if self.__checksum:
+                    f.seek(0)
+                    f.write("#sha256 " + digest.hexdigest() + "\n")
+                f.flush()
+                fsync(f.fileno())
+            chmod(tmp_path, mode)
+            replace(tmp_path, self.__file_path)
+        except BaseException:
+            remove(tmp_path)
+            raise
+        try:
+            remove(self.__file_path + ".journal")
+        except FileNotFoundError:
+            pass
+        FileStorage.__journaled = 0
+        self.__stamp()
+
+    def __append(self):
+        """appends one [key, dict or null] line per dirty object"""
+        lines = []
+        for key, obj in self.__dirty.items():
+            value = obj.to_dict() if obj is not None else None
+            lines.append(json.dumps([key, value]) + "\n")
+        with open(self.__file_path + ".journal", 'a') as f:
+            f.write("".join(lines))
+            f.flush()
+            fsync(f.fileno())
+        FileStorage.__journaled += len(lines)
+        self.__stamp()
+
+    def __stamp(self):
+        """writes a new token to the lock file after the files changed
+
+        Snapshots alternate between inodes and can keep their size and
+        mtime, so the token is what tells other processes the files
+        changed.
+        """
+        with open(self.__file_path + ".lock", 'w') as f:
+            f.write(uuid4().hex)
+        FileStorage.__signature = self.__stat()
+
+    def __stat(self):
+        """returns what identifies the current JSON file and journal: the
+        token of the last save and the stat of each file"""
+        try:
+            with open(self.__file_path + ".lock", 'r') as f:
+                signature = (f.read(),)
+        except FileNotFoundError:
+            signature = (None,)
+        for file_path in (self.__file_path, self.__file_path + ".journal"):
+            try:
+                st = stat(file_path)
+                signature += ((st.st_ino, st.st_size, st.st_mtime_ns),)
+            except FileNotFoundError:
+                signature += (None,)
+        return signature
 
     def reload(self):
-        """deserializes the JSON file to __objects"""
+        """deserializes the JSON file to __objects
+
+        __objects and its indexes are rebuilt from the files, so objects
+        deleted by other processes are dropped; changes not saved yet are
+        applied again on top. Objects are read and instantiated one at a
+        time rather than decoding the whole file first. Raises ValueError
+        if the file carries a checksum header that does not match its
+        content.
+        """
+        with self.__locked():
+            self.__objects.clear()
+            self.__pending.clear()
+            FileStorage.__indexed = None
+            try:
+                with open(self.__file_path, 'r') as f:
+                    checksum = None
+                    if f.read(8) == "#sha256 ":
+                        checksum = f.readline().strip()
+                    else:
+                        f.seek(0)
+                    digest = sha256()
+                    for key, value in self.__items(f, digest):
+                        self.__load(key, value)
+                if checksum is not None and digest.hexdigest() != checksum:
+                    raise ValueError("{} is corrupted: checksum mismatch"
+                                     .format(self.__file_path))
+            except FileNotFoundError:
+                pass
+            self.__replay()
+            for key, obj in self.__dirty.items():
+                if obj is None:
+                    self.__remove(key)
+                else:
+                    self.__add(key, obj)
+            FileStorage.__epoch += 1
+            FileStorage.__signature = self.__stat()
+        self.__notify(None)
+
+    def __items(self, f, digest, chunk_size=65536):
+        """yields the (key, value) pairs of the JSON object read from f
+
+        f is read chunk_size characters at a time and every chunk read is
+        fed to digest.
+        """
+        decoder = json.JSONDecoder()
+        buf, pos = "", 0
+
+        def read():
+            """returns the next chunk of f, fed to digest"""
+            chunk = f.read(chunk_size)
+            digest.update(chunk.encode())
+            return chunk
+
+        def peek():
+            """returns the next non-blank character, '' at end of file"""
+            nonlocal buf, pos
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\n\r":
+                    pos += 1
+                if pos < len(buf):
+                    return buf[pos]
+                buf, pos = read(), 0
+                if not buf:
+                    return ""
+
+        def value():
+            """decodes the next JSON value, reading until it is complete"""
+            nonlocal buf, pos
+            peek()
+            while True:
+                try:
+                    obj, pos = decoder.raw_decode(buf, pos)
+                    return obj
+                except json.JSONDecodeError:
+                    chunk = read()
+                    if not chunk:
+                        raise
+                    buf, pos = buf[pos:] + chunk, 0
+
+        def expect(chars):
+            """consumes the next character, which must be one of chars"""
+            nonlocal pos
+            char = peek()
+            if not char or char not in chars:
+                raise ValueError("{} is not a JSON object of objects"
+                                 .format(self.__file_path))
+            pos += 1
+            return char
+
+        if not peek():
+            return
+        expect("{")
+        if peek() == "}":
+            return
+        while True:
+            key = value()
+            expect(":")
+            yield key, value()
+            if expect(",}") == "}":
+                return
+
+    def __replay(self):
+        """applies the records of the journal on top of the snapshot
+
+        A record torn by a crash while it was appended is cut off the
+        journal, with anything after it, so records appended later are not
+        written after it and lost on the next reload.
+        """
+        journaled = 0
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
-        except Exception as ex:
+            with open(self.__file_path + ".journal", 'rb+') as f:
+                good, torn = 0, False
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("unterminated record")
+                        key, value = json.loads(line)
+                    except (TypeError, ValueError):
+                        torn = True
+                        break
+                    if value is None:
+                        self.__remove(key)
+                    else:
+                        self.__load(key, value)
+                    good += len(line)
+                    journaled += 1
+                if torn:
+                    f.truncate(good)
+                    f.flush()
+                    fsync(f.fileno())
+        except FileNotFoundError:
             pass
+        FileStorage.__journaled = journaled
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
         if obj is not None:
-            key = obj.to_dict()['__class__'] + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+            key = obj.__class__.__name__ + '.' + obj.id
+            self.__remove(key)
+            self.__changed(obj.__class__.__name__)
+            self.__notify(obj.__class__.__name__)
+            self.__dirty[key] = None
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """call reload() method if the JSON file changed on disk"""
+        if self.__stat() != self.__signature:
+            self.reload()
 
     def get(self, cls, id):
         """returns the object with the given id and class"""
         if cls in classes.values() and id and isinstance(id, str):
-            d_obj = self.all(cls)
-            for value in d_obj.values():
-                if value.id == id:
-                    return value
+            return self.__object(cls.__name__ + '.' + id)
         return None
 
+    def children(self, cls, parent_id):
+        """returns the objects of cls whose foreign key is parent_id
+
+        cls is City (state_id), Place (city_id) or Review (place_id).
+        """
+        name = cls.__name__
+        foreign_key = self.__foreign_keys[name]
+        self.__buckets()
+        objs = []
+        for key in list(self.__children.get((name, parent_id), ())):
+            obj = self.__object(key)
+            if obj is not None and getattr(obj, foreign_key) == parent_id:
+                objs.append(obj)
+        return objs
+
+    def __locate(self, key, latitude, longitude):
+        """moves the place key to the grid cell of (latitude, longitude), or
+        drops it if either is not a number"""
+        latitude = self.__number(latitude)
+        longitude = self.__number(longitude)
+        old = self.__cells.pop(key, None)
+        new = None
+        if latitude is not None and longitude is not None:
+            new = (floor(latitude / self.__cell_size),
+                   floor(longitude / self.__cell_size))
+        if old is not None and old != new:
+            cell = self.__grid[old]
+            del cell[key]
+            if not cell:
+                del self.__grid[old]
+        if new is not None:
+            self.__grid.setdefault(new, {})[key] = None
+            self.__cells[key] = new
+
+    def __within_box(self, box):
+        """returns the place keys in the grid cells covering box"""
+        self.__buckets()
+        if not self.__gridded:
+            for key, obj in self.__by_class.get("Place", {}).items():
+                self.__locate(key, getattr(obj, "latitude", None),
+                              getattr(obj, "longitude", None))
+            for key, value in self.__pending.get("Place", {}).items():
+                self.__locate(key, value.get("latitude"),
+                              value.get("longitude"))
+            FileStorage.__gridded = True
+        south, west, north, east = box
+        size = self.__cell_size
+        rows = range(floor(south / size), floor(north / size) + 1)
+        if west <= east:
+            columns = range(floor(west / size), floor(east / size) + 1)
+        else:
+            columns = (list(range(floor(west / size), floor(180 / size) + 1)) +
+                       list(range(floor(-180 / size), floor(east / size) + 1)))
+        if len(rows) * len(columns) > len(self.__grid):
+            columns = set(columns)
+            cells = [cell for cell in self.__grid
+                     if cell[0] in rows and cell[1] in columns]
+        else:
+            cells = [(row, column) for row in rows for column in columns
+                     if (row, column) in self.__grid]
+        keys = []
+        for cell in cells:
+            keys.extend(self.__grid[cell])
+        return keys
+
+    def __read(self, key, field):
+        """indexes the words of the place or review key under the place
+        they describe, or drops key if field, its attribute getter, is
+        None"""
+        old = self.__words_of.pop(key, None)
+        if old is not None:
+            for word in old[1]:
+                keys = self.__postings[word]
+                del keys[key]
+                if not keys:
+                    del self.__postings[word]
+                    del self.__vocabulary[bisect_left(self.__vocabulary,
+                                                      word)]
+        if field is None:
+            return
+        name = key.split('.', 1)[0]
+        if name == "Place":
+            place_id, texts = key.split('.', 1)[1], ("name", "description")
+        elif name == "Review":
+            place_id, texts = field("place_id"), ("text",)
+        else:
+            return
+        new = set()
+        for text in texts:
+            if isinstance(field(text), str):
+                new.update(words(field(text)))
+        if place_id is None or not new:
+            return
+        for word in new:
+            if word not in self.__postings:
+                self.__postings[word] = {}
+                insort(self.__vocabulary, word)
+            self.__postings[word][key] = None
+        self.__words_of[key] = ("Place." + place_id, new)
+
+    def __search(self, text):
+        """returns the place keys whose name and description, or the text
+        of one of their reviews, have a word starting with each word of
+        text"""
+        self.__buckets()
+        if not self.__worded:
+            for name in ("Place", "Review"):
+                for key, obj in self.__by_class.get(name, {}).items():
+                    self.__read(key, lambda attr: getattr(obj, attr, None))
+                for key, value in self.__pending.get(name, {}).items():
+                    self.__read(key, value.get)
+            FileStorage.__worded = True
+        keys = None
+        for prefix in words(text):
+            start = bisect_left(self.__vocabulary, prefix)
+            end = bisect_left(self.__vocabulary, prefix + chr(0x10ffff))
+            with_prefix = set()
+            for word in self.__vocabulary[start:end]:
+                with_prefix.update(self.__postings[word])
+            keys = with_prefix if keys is None else keys & with_prefix
+        return {self.__words_of[key][0] for key in keys or ()}
+
+    def __located(self, place, box, near):
+        """tells if place is in box and within near, (latitude, longitude,
+        radius in kilometers), each one ignored if None"""
+        latitude = self.__number(getattr(place, "latitude", None))
+        longitude = self.__number(getattr(place, "longitude", None))
+        if latitude is None or longitude is None:
+            return False
+        if box is not None and not in_box(latitude, longitude, box):
+            return False
+        return near is None or distance(latitude, longitude,
+                                        near[0], near[1]) <= near[2]
+
+    def places_in(self, states=(), cities=(), amenities=(), limit=None,
+                  after=None, ranges=None, box=None, near=None, text=None,
+                  among=None):
+        """returns the places of the given states and cities, or all places,
+        that have every amenity of amenities and whose attributes are
+        within ranges, a dictionary of (low, high) by attribute
+
+        box (south, west, north, east) and near (latitude, longitude,
+        radius in kilometers) keep the places located in them. text keeps
+        the places whose name and description, or one of whose reviews,
+        have a word starting with each of its words. among, a set of place
+        keys, keeps the places picked there.
+
+        Places are reached through the state_id and city_id indexes, each
+        place once, and filtered by intersecting the places of each
+        amenity, each range and each area and the matches of text,
+        smallest first. Areas are looked up in a grid of __cell_size
+        degrees and words in an inverted index kept sorted for prefixes.
+        With limit or after, the result is paged like page() does.
+        """
+        ranges = ranges or {}
+        areas = [] if box is None else [box]
+        if near is not None:
+            areas.append(bounding_box(*near))
+        text = text if text and words(text) else None
+        if not states and not cities and not amenities and not ranges:
+            if not areas and text is None and among is None and (
+                    limit is not None or after is not None):
+                return self.page(Place, limit, after)
+        self.__buckets()
+        keys = None
+        if amenities or ranges or areas or text is not None or (
+                among is not None):
+            with_each = [self.__places_with.get(amenity_id, {})
+                         for amenity_id in set(amenities)]
+            if among is not None:
+                with_each.append(among)
+            with_each.extend(set(self.__between("Place", attr, low, high))
+                             for attr, (low, high) in ranges.items())
+            with_each.extend(set(self.__within_box(area)) for area in areas)
+            if text is not None:
+                with_each.append(self.__search(text))
+            with_each.sort(key=len)
+            keys = [key for key in with_each[0]
+                    if all(key in places for places in with_each[1:])]
+        if states or cities:
+            city_ids = []
+            for state_id in states:
+                city_ids.extend(city.id
+                                for city in self.children(City, state_id))
+            city_ids.extend(cities)
+            places = {}
+            for city_id in city_ids:
+                for place in self.children(Place, city_id):
+                    places[place.id] = place
+            places = list(places.values())
+            if keys is not None:
+                keys = set(keys)
+                places = [place for place in places
+                          if "Place." + place.id in keys]
+        elif keys is not None:
+            places = [self.__object(key) for key in keys]
+            places = [place for place in places if place is not None]
+        else:
+            places = list(self.all(Place).values())
+        if amenities:
+            wanted = set(amenities)
+            places = [place for place in places
+                      if wanted.issubset(place.amenity_ids)]
+        for attr, (low, high) in ranges.items():
+            places = [place for place in places
+                      if self.__within(getattr(place, attr, None), low, high)]
+        if areas:
+            places = [place for place in places
+                      if self.__located(place, box, near)]
+        if limit is not None or after is not None:
+            places.sort(key=self.__sort_key)
+            if after is not None:
+                after = tuple(after)
+                places = [place for place in places
+                          if self.__sort_key(place) > after]
+            if limit is not None:
+                places = places[:limit]
+        return places
+
+    def __within(self, value, low, high):
+        """tells if value is a number between low and high"""
+        value = self.__number(value)
+        return (value is not None and (low is None or value >= low) and
+                (high is None or value <= high))
+
+    def range(self, cls, attr, low=None, high=None):
+        """returns the objects of cls with low <= attr <= high
+
+        Either bound may be None. The values of attr are kept in a sorted
+        list per class, built on first use, so a range costs
+        O(log n + k). Objects whose attr is not a number never match.
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        objs = []
+        for key in self.__between(name, attr, low, high):
+            obj = self.__object(key)
+            if obj is not None and self.__within(getattr(obj, attr, None),
+                                                 low, high):
+                objs.append(obj)
+        return objs
+
+    def page(self, cls, limit=None, after=None):
+        """returns the objects of cls ordered by (created_at, id)
+
+        Only the limit first objects (all if None) that sort after the
+        (created_at, id) pair after are returned. The order is kept in a
+        sorted list per class, so a page costs O(log n + limit).
+        """
+        name = cls if isinstance(cls, str) else cls.__name__
+        ordered = self.__ordered(name)
+        start = 0 if after is None else bisect_right(ordered, tuple(after))
+        end = len(ordered) if limit is None else start + limit
+        return [self.__object(name + '.' + id)
+                for created_at, id in ordered[start:end]]
+
     def count(self, cls=None):
         """returns the number of objects in __objects"""
-        data = self.all(cls)
-        if cls in classes.values():
-            data = self.all(cls)
-            return len(data)
+        if cls is None:
+            return len(self.__objects) + sum(
+                len(pending) for pending in self.__pending.values())
+        return sum(len(self.__buckets().get(name, {})) +
+                   len(self.__pending.get(name, {}))
+                   for name in self.__names(cls))
+
+    def __changed(self, name):
+        """counts a change to the objects of class name"""
+        self.__versions[name] = self.__versions.get(name, 0) + 1
+
+    def subscribe(self, listener):
+        """calls listener(name) whenever objects of class name are changed
+        by new(), delete() or save(), and listener(None) on reload()"""
+        self.__listeners.append(listener)
+
+    def __notify(self, name):
+        """calls every listener with name"""
+        for listener in self.__listeners:
+            listener(name)
+
+    def version(self, cls=None):
+        """returns a string that changes whenever the objects of cls, or
+        any object if cls is None, may have changed
+
+        Objects changed without new() or delete() do not count.
+        """
+        self.__buckets()
+        if cls is None:
+            changes = sum(self.__versions.values())
+        else:
+            name = cls if isinstance(cls, str) else cls.__name__
+            changes = self.__versions.get(name, 0)
+        return "{}-{}-{}".format(self.__nonce, self.__epoch, changes)
+
+    def counts(self):
+        """returns the number of objects of every class"""
+        return {name: self.count(name) for name in classes}
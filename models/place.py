@@ -2,11 +2,63 @@
 """ holds class Place"""
 import models
 from models.base_model import BaseModel, Base
+from math import asin, cos, degrees, radians, sin, sqrt
 from os import getenv
+import re
 import sqlalchemy
-from sqlalchemy import Column, String, Integer, Float, ForeignKey, Table
+from sqlalchemy import Column, String, Integer, Float, ForeignKey, Index, Table
 from sqlalchemy.orm import relationship
 
+# mean radius of the Earth, in kilometers
+EARTH_RADIUS = 6371.0088
+
+
+def distance(latitude, longitude, other_latitude, other_longitude):
+    """returns the great-circle distance in kilometers between two points"""
+    half_dlat = radians(other_latitude - latitude) / 2
+    half_dlon = radians(other_longitude - longitude) / 2
+    a = (sin(half_dlat) ** 2 + cos(radians(latitude)) *
+         cos(radians(other_latitude)) * sin(half_dlon) ** 2)
+    return 2 * EARTH_RADIUS * asin(min(1.0, sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius):
+    """returns the (south, west, north, east) box holding every point at
+    most radius kilometers away from (latitude, longitude)
+
+    west is greater than east when the box crosses the antimeridian.
+    """
+    angle = radius / EARTH_RADIUS
+    south = latitude - degrees(angle)
+    north = latitude + degrees(angle)
+    if south <= -90 or north >= 90 or sin(angle) >= cos(radians(latitude)):
+        return (max(south, -90.0), -180.0, min(north, 90.0), 180.0)
+    delta = degrees(asin(sin(angle) / cos(radians(latitude))))
+    west = longitude - delta
+    east = longitude + delta
+    if west < -180:
+        west += 360
+    if east > 180:
+        east -= 360
+    return (south, west, north, east)
+
+
+def in_box(latitude, longitude, box):
+    """tells if (latitude, longitude) is in the box (south, west, north,
+    east)"""
+    south, west, north, east = box
+    if not south <= latitude <= north:
+        return False
+    if west <= east:
+        return west <= longitude <= east
+    return longitude >= west or longitude <= east
+
+
+def words(text):
+    """returns the lowercase words of text, in order, each one once"""
+    return list(dict.fromkeys(re.findall(r"\w+", text.lower())))
+
+
 if models.storage_t == 'db':
     place_amenity = Table('place_amenity', Base.metadata,
                           Column('place_id', String(60),
@@ -27,16 +79,25 @@ class Place(BaseModel, Base):
         user_id = Column(String(60), ForeignKey('users.id'), nullable=False)
         name = Column(String(128), nullable=False)
         description = Column(String(1024), nullable=True)
-        number_rooms = Column(Integer, nullable=False, default=0)
-        number_bathrooms = Column(Integer, nullable=False, default=0)
-        max_guest = Column(Integer, nullable=False, default=0)
-        price_by_night = Column(Integer, nullable=False, default=0)
+        number_rooms = Column(Integer, nullable=False, default=0,
+                              index=True)
+        number_bathrooms = Column(Integer, nullable=False, default=0,
+                                  index=True)
+        max_guest = Column(Integer, nullable=False, default=0,
+                           index=True)
+        price_by_night = Column(Integer, nullable=False, default=0,
+                                index=True)
         latitude = Column(Float, nullable=True)
         longitude = Column(Float, nullable=True)
         reviews = relationship("Review", backref="place")
         amenities = relationship("Amenity", secondary="place_amenity",
                                  backref="place_amenities",
                                  viewonly=False)
+        __table_args__ = (Index('ix_places_latitude_longitude',
+                                'latitude', 'longitude'),
+                          Index('ix_places_name_description',
+                                'name', 'description',
+                                mysql_prefix='FULLTEXT'))
     else:
         city_id = ""
         user_id = ""
@@ -53,26 +114,23 @@ class Place(BaseModel, Base):
     def __init__(self, *args, **kwargs):
         """initializes Place"""
         super().__init__(*args, **kwargs)
+        if models.storage_t != 'db' and "amenity_ids" not in self.__dict__:
+            self.amenity_ids = []
 
     if models.storage_t != 'db':
         @property
         def reviews(self):
             """getter attribute returns the list of Review instances"""
             from models.review import Review
-            review_list = []
-            all_reviews = models.storage.all(Review)
-            for review in all_reviews.values():
-                if review.place_id == self.id:
-                    review_list.append(review)
-            return review_list
+            return models.storage.children(Review, self.id)
 
         @property
         def amenities(self):
             """getter attribute returns the list of Amenity instances"""
             from models.amenity import Amenity
             amenity_list = []
-            all_amenities = models.storage.all(Amenity)
-            for amenity in all_amenities.values():
-                if amenity.place_id == self.id:
+            for amenity_id in self.amenity_ids:
+                amenity = models.storage.get(Amenity, amenity_id)
+                if amenity is not None:
                     amenity_list.append(amenity)
             return amenity_list
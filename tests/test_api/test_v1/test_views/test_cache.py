@@ -0,0 +1,318 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheDocs, TestMemoryBackend, TestResponseCache and
+TestCached classes
+"""
+
+from flask import Flask
+from importlib import import_module
+import inspect
+import os
+import models
+from api.v1.views import cache_backends
+from api.v1.views.streaming import stream_json
+from models.state import State
+from models.user import User
+import pep8
+from tests.test_api.test_v1.test_views.test_places import ViewTestCase
+from time import time
+import unittest
+from unittest.mock import patch
+# the module, which the cache instance exported by api.v1.views shadows
+cache_module = import_module("api.v1.views.cache")
+MemoryBackend = cache_backends.MemoryBackend
+ResponseCache = cache_module.ResponseCache
+cached = cache_module.cached
+
+
+def later(seconds):
+    """Returns a patch moving the clock of the backends seconds ahead"""
+    return patch.object(cache_backends, "time",
+                        return_value=time() + seconds)
+
+
+class TestCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of cache"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cache_f = inspect.getmembers(ResponseCache, inspect.isfunction)
+
+    def test_pep8_conformance_cache(self):
+        """Test that api/v1/views/cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cache(self):
+        """Test tests/test_api/test_v1/test_views/test_cache.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_module_docstring(self):
+        """Test for the cache.py module docstring"""
+        self.assertIsNot(cache_module.__doc__, None,
+                         "cache.py needs a docstring")
+        self.assertTrue(len(cache_module.__doc__) >= 1,
+                        "cache.py needs a docstring")
+
+    def test_response_cache_func_docstrings(self):
+        """Test for the presence of docstrings in ResponseCache methods"""
+        for func in self.cache_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestMemoryBackend(unittest.TestCase):
+    """Test the MemoryBackend class"""
+    def setUp(self):
+        """A backend of 3 entries"""
+        self.backend = MemoryBackend(3)
+
+    def test_get_set(self):
+        """Test that set values are got back until they expire"""
+        self.assertIsNone(self.backend.get("a"))
+        self.assertEqual(self.backend.set("a", b"1", 60), 0)
+        self.assertEqual(self.backend.get("a"), b"1")
+        self.backend.set("a", b"2", 60)
+        self.assertEqual(self.backend.get("a"), b"2")
+        self.assertEqual(self.backend.count(), 1)
+        with later(61):
+            self.assertIsNone(self.backend.get("a"))
+        self.assertEqual(self.backend.count(), 0)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        for key in ("a", "b", "c"):
+            self.assertEqual(self.backend.set(key, key.encode(), 60), 0)
+        self.assertEqual(self.backend.get("a"), b"a")
+        self.assertEqual(self.backend.set("d", b"d", 60), 1)
+        self.assertIsNone(self.backend.get("b"))
+        for key in ("a", "c", "d"):
+            self.assertEqual(self.backend.get(key), key.encode())
+        self.assertEqual(self.backend.count(), 3)
+
+    def test_size_zero(self):
+        """Test that a backend of size 0 keeps nothing"""
+        backend = MemoryBackend(0)
+        self.assertEqual(backend.set("a", b"1", 60), 1)
+        self.assertIsNone(backend.get("a"))
+        self.assertEqual(backend.count(), 0)
+
+    def test_bump(self):
+        """Test that bump increments the generation of each name"""
+        self.assertEqual(self.backend.generations(("State", "")), (0, 0))
+        self.backend.bump(("State",))
+        self.backend.bump(("State", ""))
+        self.assertEqual(self.backend.generations(("State", "", "City")),
+                         (2, 1, 0))
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the ResponseCache class"""
+    value = (b"[]", 200, [["Content-Type", "application/json"]])
+
+    def setUp(self):
+        """A cache of 2 entries kept 60 seconds"""
+        self.cache = ResponseCache(MemoryBackend(2), 60)
+
+    def put(self, key, names):
+        """Stores value under key at the current generation of names"""
+        self.cache.put(key, self.cache.generation(names), self.value)
+
+    def test_hit_miss(self):
+        """Test that hits and misses are counted"""
+        self.assertIsNone(self.cache.get("/states", ("State",)))
+        self.put("/states", ("State",))
+        self.assertEqual(self.cache.get("/states", ("State",)), self.value)
+        self.assertEqual(self.cache.get("/states", ("State",)), self.value)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["size"]),
+                         (2, 1, 1))
+
+    def test_invalidate(self):
+        """Test that invalidating a class only stales the entries built
+        from it, and every entry when no class is given"""
+        self.put("/states", ("State",))
+        self.put("/amenities", ("Amenity",))
+        self.cache.invalidate("State")
+        self.assertIsNone(self.cache.get("/states", ("State",)))
+        self.assertEqual(self.cache.get("/amenities", ("Amenity",)),
+                         self.value)
+        self.cache.invalidate()
+        self.assertIsNone(self.cache.get("/amenities", ("Amenity",)))
+        self.assertEqual(self.cache.stats()["invalidations"], 2)
+
+    def test_invalidate_any(self):
+        """Test that entries built from every class stale on any change"""
+        self.put("/stats", (None,))
+        self.cache.invalidate("Review")
+        self.assertIsNone(self.cache.get("/stats", (None,)))
+
+    def test_ttl(self):
+        """Test that entries expire after ttl seconds"""
+        self.put("/states", ("State",))
+        with later(59):
+            self.assertEqual(self.cache.get("/states", ("State",)),
+                             self.value)
+        with later(61):
+            self.assertIsNone(self.cache.get("/states", ("State",)))
+
+    def test_evictions(self):
+        """Test that evictions are counted"""
+        for key in ("/a", "/b", "/c"):
+            self.put(key, ("State",))
+        self.assertIsNone(self.cache.get("/a", ("State",)))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_size_zero(self):
+        """Test that a cache on a backend of size 0 stores nothing"""
+        cache = ResponseCache(MemoryBackend(0), 60)
+        cache.put("/states", cache.generation(("State",)), self.value)
+        self.assertIsNone(cache.get("/states", ("State",)))
+        self.assertEqual(cache.stats()["evictions"], 0)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestCached(ViewTestCase):
+    """Test the @cached views through the API"""
+    def setUp(self):
+        """Empty cache of 8 entries with its counters at 0"""
+        super().setUp()
+        self.cache = cache_module.cache
+        self.use(MemoryBackend(8))
+        patcher = patch.multiple(self.cache, hits=0, misses=0, evictions=0,
+                                 invalidations=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        State(name="California").save()
+
+    def use(self, backend):
+        """Makes the cache keep its entries in backend for the test"""
+        patcher = patch.object(self.cache, "backend", backend)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def counters(self):
+        """Returns the hits and misses of the cache"""
+        return self.cache.hits, self.cache.misses
+
+    def test_hit(self):
+        """Test that a second GET is answered from the cache"""
+        first = self.client.get('/api/v1/states')
+        self.assertEqual(self.counters(), (0, 1))
+        second = self.client.get('/api/v1/states')
+        self.assertEqual(self.counters(), (1, 1))
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.mimetype, "application/json")
+        self.assertEqual(self.client.get('/api/v1/stats/cache')
+                         .get_json()["hits"], 1)
+
+    def test_write_through_api(self):
+        """Test that a GET after a write through the API sees it"""
+        self.client.get('/api/v1/states')
+        response = self.client.post('/api/v1/states',
+                                    json={"name": "Nevada"})
+        self.assertEqual(response.status_code, 201)
+        names = {state["name"] for state in
+                 self.client.get('/api/v1/states').get_json()}
+        self.assertEqual(names, {"California", "Nevada"})
+        self.assertEqual(self.counters(), (0, 2))
+
+    def test_invalidated_by_storage(self):
+        """Test that new, save and delete on storage stale the entries"""
+        url = '/api/v1/states'
+        self.client.get(url)
+        state = State(name="Nevada")
+        models.storage.new(state)
+        models.storage.save()
+        self.assertEqual(len(self.client.get(url).get_json()), 2)
+        state.name = "Silver State"
+        state.save()
+        self.assertIn("Silver State", {state["name"] for state in
+                                       self.client.get(url).get_json()})
+        models.storage.delete(state)
+        models.storage.save()
+        self.assertEqual(len(self.client.get(url).get_json()), 1)
+        self.assertEqual(self.counters(), (0, 4))
+
+    def test_other_class(self):
+        """Test that changes to other classes keep the entries fresh,
+        except for views built from every class"""
+        self.client.get('/api/v1/states')
+        self.client.get('/api/v1/stats')
+        User(email="a@b.c", password="pwd").save()
+        self.client.get('/api/v1/states')
+        self.assertEqual(self.counters(), (1, 2))
+        self.assertEqual(self.client.get('/api/v1/stats')
+                         .get_json()["users"], 1)
+        self.assertEqual(self.counters(), (1, 3))
+
+    def test_ttl(self):
+        """Test that entries expire after the ttl of the cache"""
+        self.client.get('/api/v1/states')
+        with later(self.cache.ttl + 1):
+            self.client.get('/api/v1/states')
+        self.assertEqual(self.counters(), (0, 2))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used response is evicted"""
+        self.use(MemoryBackend(2))
+        for url in ('/api/v1/states', '/api/v1/amenities',
+                    '/api/v1/states', '/api/v1/stats', '/api/v1/states',
+                    '/api/v1/amenities'):
+            self.client.get(url)
+        self.assertEqual(self.counters(), (2, 4))
+        self.assertEqual(self.cache.evictions, 2)
+
+    def client_of(self, view):
+        """Returns a test client of an app serving view, cached as built
+        from the states, at /view"""
+        app = Flask(__name__)
+        app.add_url_rule('/view', view_func=cached(State)(view))
+        return app.test_client()
+
+    def test_not_ok(self):
+        """Test that responses other than 200 are not cached"""
+        for i in range(2):
+            response = self.client.get('/api/v1/states/nope/cities')
+            self.assertEqual(response.status_code, 404)
+        client = self.client_of(lambda: ({"queued": True}, 202))
+        for i in range(2):
+            self.assertEqual(client.get('/view').status_code, 202)
+        self.assertEqual(self.counters(), (0, 4))
+        self.assertEqual(self.cache.backend.count(), 0)
+
+    def test_streamed(self):
+        """Test that streamed responses are not cached"""
+        client = self.client_of(lambda: stream_json(
+            state.to_dict() for state in models.storage.all(State).values()))
+        for i in range(2):
+            response = client.get('/view')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.get_json()), 1)
+        self.assertEqual(self.counters(), (0, 2))
+        self.assertEqual(self.cache.backend.count(), 0)
+
+    def test_cache_size_zero(self):
+        """Test that HBNB_CACHE_SIZE=0 turns the cache off"""
+        with patch.dict(os.environ, {"HBNB_CACHE_SIZE": "0",
+                                     "HBNB_CACHE_BACKEND": "memory"}):
+            self.use(cache_backends.backend_from_env())
+        for i in range(2):
+            response = self.client.get('/api/v1/states')
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.counters(), (0, 2))
+        self.assertEqual(self.cache.stats()["size"], 0)
+        self.assertEqual(self.cache.evictions, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+"""
+Contains the TestCacheBackendsDocs and TestSQLiteBackend classes
+"""
+
+import inspect
+import os
+from api.v1.views import cache_backends
+import pep8
+import tempfile
+import unittest
+from unittest.mock import patch
+SQLiteBackend = cache_backends.SQLiteBackend
+
+
+class TestCacheBackendsDocs(unittest.TestCase):
+    """Tests to check the documentation and style of cache_backends"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.sqlite_f = inspect.getmembers(SQLiteBackend, inspect.isfunction)
+
+    def test_pep8_conformance_cache_backends(self):
+        """Test that api/v1/views/cache_backends.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/cache_backends.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_cache_backends(self):
+        """Test test_cache_backends.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_cache_backends.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_cache_backends_module_docstring(self):
+        """Test for the cache_backends.py module docstring"""
+        self.assertIsNot(cache_backends.__doc__, None,
+                         "cache_backends.py needs a docstring")
+        self.assertTrue(len(cache_backends.__doc__) >= 1,
+                        "cache_backends.py needs a docstring")
+
+    def test_sqlite_backend_func_docstrings(self):
+        """Test for the presence of docstrings in SQLiteBackend methods"""
+        for func in self.sqlite_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+class TestSQLiteBackend(unittest.TestCase):
+    """Test the SQLiteBackend class"""
+    def setUp(self):
+        """Open a backend of 3 entries in a temporary directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.db")
+        self.backend = SQLiteBackend(self.path, 3)
+
+    def tearDown(self):
+        """Remove the temporary directory"""
+        self.directory.cleanup()
+
+    def test_get_set(self):
+        """Test that set values are got back until they expire"""
+        self.assertIsNone(self.backend.get("a"))
+        self.assertEqual(self.backend.set("a", b"1", 60), 0)
+        self.assertEqual(self.backend.get("a"), b"1")
+        self.backend.set("a", b"2", 60)
+        self.assertEqual(self.backend.get("a"), b"2")
+        self.assertEqual(self.backend.count(), 1)
+        with patch.object(cache_backends, "time", return_value=1e12):
+            self.assertIsNone(self.backend.get("a"))
+
+    def test_eviction(self):
+        """Test that entries closest to expiring are evicted first"""
+        for key in ("a", "b", "c"):
+            self.assertEqual(self.backend.set(key, key.encode(), 60), 0)
+        self.assertEqual(self.backend.set("d", b"d", 60), 1)
+        self.assertIsNone(self.backend.get("a"))
+        self.assertEqual(self.backend.count(), 3)
+        self.backend.set("b", b"b", 120)
+        self.assertEqual(self.backend.set("e", b"e", 60), 1)
+        self.assertIsNone(self.backend.get("c"))
+        self.assertEqual(self.backend.get("b"), b"b")
+
+    def test_eviction_of_expired(self):
+        """Test that every expired entry goes when making room"""
+        for key in ("a", "b", "c"):
+            self.backend.set(key, key.encode(), -1)
+        self.assertEqual(self.backend.set("d", b"d", 60), 3)
+        self.assertEqual(self.backend.count(), 1)
+        self.assertEqual(self.backend.get("d"), b"d")
+
+    def test_bump(self):
+        """Test that bump increments the generation of each name"""
+        self.assertEqual(self.backend.generations(("State", "")), (0, 0))
+        self.backend.bump(("State",))
+        self.backend.bump(("State", ""))
+        self.assertEqual(self.backend.generations(("State", "", "City")),
+                         (2, 1, 0))
+
+    def test_shared_file(self):
+        """Test that two backends on one file see each other's changes"""
+        other = SQLiteBackend(self.path, 3)
+        self.backend.set("a", b"1", 60)
+        self.assertEqual(other.get("a"), b"1")
+        other.set("a", b"2", 60)
+        self.assertEqual(self.backend.get("a"), b"2")
+        other.bump(("State",))
+        self.assertEqual(self.backend.generations(("State",)), (1,))
+        for key in ("b", "c", "d"):
+            other.set(key, key.encode(), 60)
+        self.assertEqual(self.backend.count(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
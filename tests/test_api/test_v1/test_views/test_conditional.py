@@ -0,0 +1,197 @@
+#!/usr/bin/python3
+"""
+Contains the TestConditionalDocs, TestObjectResponse and TestVersioned
+classes
+"""
+
+from datetime import timedelta
+import inspect
+import models
+from api.v1.views import conditional
+from models.state import State
+from models.user import User
+import pep8
+from tests.test_api.test_v1.test_views.test_places import ViewTestCase
+import unittest
+from werkzeug.http import http_date
+
+
+class TestConditionalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of conditional"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.conditional_f = inspect.getmembers(conditional,
+                                               inspect.isfunction)
+
+    def test_pep8_conformance_conditional(self):
+        """Test that api/v1/views/conditional.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_conditional(self):
+        """Test test_conditional.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_conditional_module_docstring(self):
+        """Test for the conditional.py module docstring"""
+        self.assertIsNot(conditional.__doc__, None,
+                         "conditional.py needs a docstring")
+        self.assertTrue(len(conditional.__doc__) >= 1,
+                        "conditional.py needs a docstring")
+
+    def test_conditional_func_docstrings(self):
+        """Test for the presence of docstrings in conditional functions"""
+        for func in self.conditional_f:
+            if func[1].__module__ != conditional.__name__:
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class ConditionalTestCase(ViewTestCase):
+    """Runs each test against the API with conditional GET helpers"""
+    def revalidate(self, url, **headers):
+        """Gets url sending headers, with - in place of _ in their names"""
+        return self.client.get(url, headers={
+            name.replace("_", "-"): value for name, value in headers.items()})
+
+    def assertChanged(self, url, etag):
+        """Checks url no longer has the ETag etag and returns the new one"""
+        response = self.revalidate(url, If_None_Match=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        return response.headers["ETag"]
+
+    def assertUnchanged(self, url, etag):
+        """Checks url still has the ETag etag"""
+        response = self.revalidate(url, If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestObjectResponse(ConditionalTestCase):
+    """Test conditional GETs of single objects"""
+    def setUp(self):
+        """Saves a state and a user"""
+        super().setUp()
+        self.state = State(name="California")
+        self.state.save()
+        self.user = User(email="a@b.c", password="pwd")
+        self.user.save()
+        self.url = '/api/v1/states/{}'.format(self.state.id)
+
+    def test_etag(self):
+        """Test the ETag of an object changes when it is updated"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+        etag = response.headers["ETag"]
+        self.assertUnchanged(self.url, etag)
+        self.client.put(self.url, json={"name": "Golden State"})
+        self.assertChanged(self.url, etag)
+
+    def test_etag_per_object(self):
+        """Test objects have different ETags"""
+        url = '/api/v1/users/{}'.format(self.user.id)
+        etag = self.client.get(url).headers["ETag"]
+        self.assertUnchanged(url, etag)
+        self.assertNotEqual(self.client.get(self.url).headers["ETag"], etag)
+
+    def test_last_modified(self):
+        """Test If-Modified-Since against the updated_at of the object"""
+        response = self.client.get(self.url)
+        last_modified = response.headers["Last-Modified"]
+        self.assertEqual(last_modified, http_date(self.state.updated_at))
+        response = self.revalidate(self.url,
+                                   If_Modified_Since=last_modified)
+        self.assertEqual(response.status_code, 304)
+        earlier = http_date(self.state.updated_at - timedelta(seconds=1))
+        response = self.revalidate(self.url, If_Modified_Since=earlier)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "California")
+
+    def test_etag_over_last_modified(self):
+        """Test If-Modified-Since is ignored along with If-None-Match"""
+        last_modified = self.client.get(self.url).headers["Last-Modified"]
+        response = self.revalidate(self.url, If_None_Match='"other"',
+                                   If_Modified_Since=last_modified)
+        self.assertEqual(response.status_code, 200)
+
+    def test_not_found(self):
+        """Test a missing object is not answered 304"""
+        response = self.revalidate('/api/v1/states/nope', If_None_Match="*")
+        self.assertEqual(response.status_code, 404)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestVersioned(ConditionalTestCase):
+    """Test conditional GETs of collections"""
+    def setUp(self):
+        """Saves a state"""
+        super().setUp()
+        State(name="California").save()
+
+    def etag(self, url):
+        """Returns the ETag of url"""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.headers["ETag"]
+
+    def test_states(self):
+        """Test the ETag of /states only changes with the states"""
+        url = '/api/v1/states'
+        etag = self.etag(url)
+        self.assertUnchanged(url, etag)
+        User(email="a@b.c", password="pwd").save()
+        self.assertUnchanged(url, etag)
+        self.client.post(url, json={"name": "Nevada"})
+        etag = self.assertChanged(url, etag)
+        self.assertEqual(len(self.client.get(url).get_json()), 2)
+        state = list(models.storage.all(State).values())[0]
+        self.client.delete('{}/{}'.format(url, state.id))
+        self.assertChanged(url, etag)
+
+    def test_users(self):
+        """Test the ETag of /users only changes with the users"""
+        url = '/api/v1/users'
+        etag = self.etag(url)
+        State(name="Nevada").save()
+        self.assertUnchanged(url, etag)
+        response = self.client.post(url, json={"email": "a@b.c",
+                                               "password": "pwd"})
+        self.assertEqual(response.status_code, 201)
+        etag = self.assertChanged(url, etag)
+        self.client.put('{}/{}'.format(url, response.get_json()["id"]),
+                        json={"first_name": "Betty"})
+        self.assertChanged(url, etag)
+
+    def test_stats(self):
+        """Test the ETag of /stats changes with every class"""
+        url = '/api/v1/stats'
+        etag = self.etag(url)
+        self.assertUnchanged(url, etag)
+        User(email="a@b.c", password="pwd").save()
+        etag = self.assertChanged(url, etag)
+        self.assertEqual(self.client.get(url).get_json()["users"], 1)
+        State(name="Nevada").save()
+        self.assertChanged(url, etag)
+
+    def test_per_url(self):
+        """Test the ETag of a collection depends on the requested URL"""
+        self.assertNotEqual(self.etag('/api/v1/stats'),
+                            self.etag('/api/v1/stats?x=1'))
+
+
+if __name__ == "__main__":
+    unittest.main()
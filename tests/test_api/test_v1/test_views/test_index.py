@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Contains the TestIndexDocs and TestPoolStats classes
+"""
+
+import inspect
+import os
+from api.v1.app import app
+from api.v1.views import index
+import pep8
+import unittest
+from unittest.mock import patch
+
+
+class TestIndexDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the index view"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.index_f = inspect.getmembers(index, inspect.isfunction)
+
+    def test_pep8_conformance_test_index(self):
+        """Test tests/test_api/test_v1/test_views/test_index.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_index.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_index_module_docstring(self):
+        """Test for the index.py module docstring"""
+        self.assertIsNot(index.__doc__, None,
+                         "index.py needs a docstring")
+        self.assertTrue(len(index.__doc__) >= 1,
+                        "index.py needs a docstring")
+
+
+class TestPoolStats(unittest.TestCase):
+    """Test who may read /api/v1/internal/pool"""
+    url = '/api/v1/internal/pool'
+    stats = {"checkouts": 1, "waits": 0, "timeouts": 0}
+
+    def setUp(self):
+        """A test client and a storage reporting pool stats"""
+        self.client = app.test_client()
+        patcher = patch.object(index.storage, "pool_stats", create=True,
+                               return_value=self.stats)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, token=None):
+        """Gets the pool stats, sending token as a bearer token"""
+        headers = {}
+        if token is not None:
+            headers["Authorization"] = "Bearer " + token
+        return self.client.get(self.url, headers=headers)
+
+    def test_disabled(self):
+        """Test the route does not exist without a configured token"""
+        with patch.dict(os.environ, {"HBNB_API_INTERNAL_TOKEN": ""}):
+            self.assertEqual(self.get().status_code, 404)
+            self.assertEqual(self.get("").status_code, 404)
+
+    def test_token(self):
+        """Test only the configured token is accepted, from anywhere"""
+        with patch.dict(os.environ, {"HBNB_API_INTERNAL_TOKEN": "s3cret"}):
+            self.assertEqual(self.get().status_code, 404)
+            self.assertEqual(self.get("wrong").status_code, 404)
+            response = self.client.get(self.url, headers={
+                "Authorization": "Bearer s3cret"},
+                environ_base={"REMOTE_ADDR": "203.0.113.5"})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json(), self.stats)
+
+    def test_file_storage(self):
+        """Test storages without a pool do not serve the route"""
+        with patch.dict(os.environ, {"HBNB_API_INTERNAL_TOKEN": "s3cret"}):
+            with patch.object(index, "storage", object()):
+                self.assertEqual(self.get("s3cret").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Contains the TestPaginationDocs, TestPageArgs and TestPaging classes
+"""
+
+from base64 import urlsafe_b64encode
+import inspect
+import models
+from api.v1.app import app
+from api.v1.views import pagination
+from models.place import Place
+import pep8
+from tests.test_api.test_v1.test_views.test_places import ViewTestCase
+import unittest
+from werkzeug.exceptions import BadRequest
+page_args = pagination.page_args
+
+
+def cursor(text):
+    """Returns text encoded as a cursor"""
+    return urlsafe_b64encode(text.encode()).decode()
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pagination"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.pagination_f = inspect.getmembers(pagination, inspect.isfunction)
+
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/views/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_pagination(self):
+        """Test tests/test_api/test_v1/test_views/test_pagination.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_module_docstring(self):
+        """Test for the pagination.py module docstring"""
+        self.assertIsNot(pagination.__doc__, None,
+                         "pagination.py needs a docstring")
+        self.assertTrue(len(pagination.__doc__) >= 1,
+                        "pagination.py needs a docstring")
+
+    def test_pagination_func_docstrings(self):
+        """Test for the presence of docstrings in pagination functions"""
+        for func in self.pagination_f:
+            if func[1].__module__ != pagination.__name__:
+                continue
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} function needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} function needs a docstring".format(func[0]))
+
+
+class TestPageArgs(unittest.TestCase):
+    """Test the reading of the limit and cursor arguments"""
+    def assertInvalid(self, args, description):
+        """Checks page_args aborts with 400 and description on args"""
+        with app.test_request_context():
+            with self.assertRaises(BadRequest) as context:
+                page_args(args)
+        self.assertEqual(context.exception.description, description)
+
+    def test_missing(self):
+        """Test missing arguments are None"""
+        with app.test_request_context():
+            self.assertEqual(page_args({}), (None, None))
+
+    def test_valid(self):
+        """Test a valid limit and cursor"""
+        created_at = "2017-09-28T21:03:54.052298"
+        args = {"limit": "2", "cursor": cursor(created_at + "|1234")}
+        with app.test_request_context():
+            self.assertEqual(page_args(args), (2, [created_at, "1234"]))
+
+    def test_invalid_limit(self):
+        """Test limits that are not positive integers"""
+        for limit in ("x", "0", "-1", "1.5", [2]):
+            self.assertInvalid({"limit": limit}, "Invalid limit")
+
+    def test_malformed_cursor(self):
+        """Test cursors that are not base64 of created_at|id"""
+        for bad in ("not base64!", cursor("no separator"),
+                    cursor("2017-09-28T21:03:54.052298|a|b"),
+                    cursor("yesterday|1234"),
+                    urlsafe_b64encode(b"\xff\xfe|1234").decode(), 5):
+            self.assertInvalid({"cursor": bad}, "Invalid cursor")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPaging(ViewTestCase):
+    """Test paging places_search with X-Next-Cursor"""
+    def setUp(self):
+        """Saves places to page through"""
+        super().setUp()
+        self.places = [Place(name=str(i)) for i in range(5)]
+        for place in self.places:
+            place.save()
+
+    def test_pages(self):
+        """Test following X-Next-Cursor lists every place once"""
+        ids, data = [], {"limit": 2}
+        while True:
+            response = self.search(data)
+            self.assertEqual(response.status_code, 200)
+            page = response.get_json()
+            self.assertLessEqual(len(page), 2)
+            ids.extend(place["id"] for place in page)
+            if "X-Next-Cursor" not in response.headers:
+                break
+            data["cursor"] = response.headers["X-Next-Cursor"]
+        self.assertEqual(sorted(ids),
+                         sorted(place.id for place in self.places))
+
+    def test_malformed_cursor(self):
+        """Test a malformed cursor is refused"""
+        response = self.search({"limit": 2, "cursor": "garbage"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid cursor", response.get_data(as_text=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
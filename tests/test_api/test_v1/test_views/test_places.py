@@ -0,0 +1,155 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesDocs and TestPlacesSearch classes
+"""
+
+import inspect
+import models
+from api.v1.app import app
+from api.v1.views import places
+from models.city import City
+from models.engine.column_storage import ColumnStorage
+from models.place import Place
+from models.state import State
+from models.user import User
+import pep8
+from tests.test_models.test_engine.test_file_storage import \
+    FileStorageTestCase
+import unittest
+
+
+class TestPlacesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of the places view"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.places_f = inspect.getmembers(places, inspect.isfunction)
+
+    def test_pep8_conformance_places(self):
+        """Test that api/v1/views/places.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_places(self):
+        """Test tests/test_api/test_v1/test_views/test_places.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_places.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_module_docstring(self):
+        """Test for the places.py module docstring"""
+        self.assertIsNot(places.__doc__, None,
+                         "places.py needs a docstring")
+        self.assertTrue(len(places.__doc__) >= 1,
+                        "places.py needs a docstring")
+
+
+class ViewTestCase(FileStorageTestCase):
+    """Runs each test against the API on an empty FileStorage saved to
+    its own file"""
+    file_path = "test_api.json"
+
+    def setUp(self):
+        """Empty FileStorage and a test client"""
+        super().setUp()
+        ColumnStorage._ColumnStorage__columns.clear()
+        self.client = app.test_client()
+
+    def tearDown(self):
+        """Restore FileStorage and remove its files"""
+        super().tearDown()
+        ColumnStorage._ColumnStorage__columns.clear()
+
+    def search(self, data):
+        """Posts data to places_search"""
+        return self.client.post('/api/v1/places_search', json=data)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPlacesSearch(ViewTestCase):
+    """Test the validation of the places_search filters"""
+    def setUp(self):
+        """Saves a place to search for"""
+        super().setUp()
+        state = State(name="California")
+        state.save()
+        city = City(name="San Francisco", state_id=state.id)
+        city.save()
+        user = User(email="a@b.c", password="pwd")
+        user.save()
+        self.place = Place(name="Loft", city_id=city.id, user_id=user.id,
+                           price_by_night=100, max_guest=2,
+                           latitude=37.77, longitude=-122.42)
+        self.place.save()
+
+    def assertInvalid(self, data, description):
+        """Checks places_search answers 400 with description to data"""
+        response = self.search(data)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(description, response.get_data(as_text=True))
+
+    def test_not_json(self):
+        """Test a body that is not JSON is refused"""
+        response = self.client.post('/api/v1/places_search', data="{}")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Not a JSON", response.get_data(as_text=True))
+
+    def test_invalid_ranges(self):
+        """Test range filters that are not {min, max} of numbers"""
+        self.assertInvalid({"price_by_night": 5}, "Invalid price_by_night")
+        self.assertInvalid({"max_guest": {"min": "a"}}, "Invalid max_guest")
+        self.assertInvalid({"number_rooms": {"max": True}},
+                           "Invalid number_rooms")
+        self.assertInvalid({"number_bathrooms": {"min": [1]}},
+                           "Invalid number_bathrooms")
+
+    def test_invalid_bbox(self):
+        """Test bboxes that are not [south, west, north, east]"""
+        self.assertInvalid({"bbox": {"south": 0}}, "Invalid bbox")
+        self.assertInvalid({"bbox": [0, 0, 1]}, "Invalid bbox")
+        self.assertInvalid({"bbox": [0, 0, 91, 1]}, "Invalid bbox")
+        self.assertInvalid({"bbox": [0, -181, 1, 1]}, "Invalid bbox")
+        self.assertInvalid({"bbox": [2, 0, 1, 1]}, "Invalid bbox")
+        self.assertInvalid({"bbox": [0, 0, "1", 1]}, "Invalid bbox")
+
+    def test_invalid_near(self):
+        """Test nears that are not {latitude, longitude, radius}"""
+        self.assertInvalid({"near": [37, -122, 1]}, "Invalid near")
+        self.assertInvalid({"near": {"latitude": 37, "longitude": -122}},
+                           "Invalid near")
+        self.assertInvalid({"near": {"latitude": 37, "longitude": -122,
+                                     "radius": -1}}, "Invalid near")
+        self.assertInvalid({"near": {"latitude": 100, "longitude": -122,
+                                     "radius": 1}}, "Invalid near")
+
+    def test_invalid_q(self):
+        """Test a q that is not a string"""
+        self.assertInvalid({"q": 5}, "Invalid q")
+
+    def test_invalid_limit(self):
+        """Test a limit that is not a positive integer"""
+        self.assertInvalid({"limit": "x"}, "Invalid limit")
+        self.assertInvalid({"limit": 0}, "Invalid limit")
+
+    def test_valid_filters(self):
+        """Test valid filters find the place"""
+        response = self.search({
+            "price_by_night": {"min": 50, "max": 150},
+            "max_guest": {"min": 2},
+            "bbox": [37, -123, 38, -122],
+            "near": {"latitude": 37.77, "longitude": -122.42, "radius": 1},
+            "q": "loft"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([place["id"] for place in response.get_json()],
+                         [self.place.id])
+        response = self.search({"price_by_night": {"min": 150}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesAmenitiesDocs and TestPlacesAmenities classes
+"""
+
+import inspect
+import models
+from api.v1.views import places_amenities
+from models.amenity import Amenity
+from models.place import Place
+import pep8
+from tests.test_api.test_v1.test_views.test_places import ViewTestCase
+import unittest
+
+
+class TestPlacesAmenitiesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of places_amenities"""
+    def test_pep8_conformance_test_places_amenities(self):
+        """Test test_places_amenities.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_places_amenities.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_places_amenities_module_docstring(self):
+        """Test for the places_amenities.py module docstring"""
+        self.assertIsNot(places_amenities.__doc__, None,
+                         "places_amenities.py needs a docstring")
+        self.assertTrue(len(places_amenities.__doc__) >= 1,
+                        "places_amenities.py needs a docstring")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestPlacesAmenities(ViewTestCase):
+    """Test the amenities of a place through the API"""
+    def setUp(self):
+        """Saves a place and an amenity"""
+        super().setUp()
+        self.place = Place(name="Loft")
+        self.place.save()
+        self.amenity = Amenity(name="Wifi")
+        self.amenity.save()
+        self.url = '/api/v1/places/{}/amenities'.format(self.place.id)
+
+    def test_registered(self):
+        """Test the amenities of a place are served"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(), [])
+        response = self.client.get('/api/v1/places/nope/amenities')
+        self.assertEqual(response.status_code, 404)
+
+    def test_link(self):
+        """Test linking and unlinking an amenity"""
+        url = '{}/{}'.format(self.url, self.amenity.id)
+        self.assertEqual(self.client.post(url).status_code, 201)
+        self.assertEqual(self.client.post(url).status_code, 200)
+        self.assertEqual([amenity["id"] for amenity in
+                          self.client.get(self.url).get_json()],
+                         [self.amenity.id])
+        self.assertEqual(self.client.delete(url).status_code, 200)
+        self.assertEqual(self.client.delete(url).status_code, 404)
+        self.assertEqual(self.client.get(self.url).get_json(), [])
+
+    def test_conditional_get(self):
+        """Test the ETag of the amenities changes when one is linked"""
+        response = self.client.get(self.url)
+        etag = response.headers["ETag"]
+        response = self.client.get(self.url,
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.client.post('{}/{}'.format(self.url, self.amenity.id))
+        response = self.client.get(self.url,
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+#!/usr/bin/python3
+"""
+Contains the TestStreamingDocs, TestStreamJson and TestStreamedPlaces
+classes
+"""
+
+import inspect
+import json
+import models
+from api.v1.app import app
+from api.v1.views import streaming
+from models.place import Place
+import pep8
+from tests.test_api.test_v1.test_views.test_places import ViewTestCase
+import unittest
+stream_json = streaming.stream_json
+
+
+class TestStreamingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of streaming"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.streaming_f = inspect.getmembers(streaming, inspect.isfunction)
+
+    def test_pep8_conformance_streaming(self):
+        """Test that api/v1/views/streaming.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_streaming(self):
+        """Test tests/test_api/test_v1/test_views/test_streaming.py PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_api/test_v1/test_views/\
+test_streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_streaming_module_docstring(self):
+        """Test for the streaming.py module docstring"""
+        self.assertIsNot(streaming.__doc__, None,
+                         "streaming.py needs a docstring")
+        self.assertTrue(len(streaming.__doc__) >= 1,
+                        "streaming.py needs a docstring")
+
+    def test_stream_json_docstring(self):
+        """Test for the stream_json docstring"""
+        self.assertIsNot(stream_json.__doc__, None,
+                         "stream_json needs a docstring")
+        self.assertTrue(len(stream_json.__doc__) >= 1,
+                        "stream_json needs a docstring")
+
+
+class TestStreamJson(unittest.TestCase):
+    """Test the output of stream_json"""
+    def body(self, dicts):
+        """Returns the body of the response of stream_json for dicts"""
+        with app.test_request_context():
+            return stream_json(iter(dicts)).get_data(as_text=True)
+
+    def test_streamed(self):
+        """Test the response is streamed as JSON"""
+        with app.test_request_context():
+            response = stream_json(iter([{"id": "1"}]))
+            self.assertTrue(response.is_streamed)
+            self.assertEqual(response.mimetype, "application/json")
+
+    def test_lazy(self):
+        """Test that dicts is consumed as the body is sent"""
+        pulled = []
+
+        def dicts():
+            """yields dictionaries, recording each one pulled"""
+            for i in range(100):
+                pulled.append(i)
+                yield {"id": str(i)}
+
+        with app.test_request_context():
+            chunks = iter(stream_json(dicts()).response)
+            self.assertEqual(pulled, [])
+            next(chunks)
+            self.assertEqual(pulled, [0])
+            next(chunks)
+            self.assertEqual(pulled, [0, 1])
+
+    def test_array(self):
+        """Test the body is the JSON array of the dictionaries"""
+        dicts = [{"id": str(i), "name": "é\"\n"} for i in range(3)]
+        body = self.body(dicts)
+        self.assertEqual(json.loads(body), dicts)
+        self.assertTrue(body.endswith("]\n"))
+
+    def test_empty(self):
+        """Test nothing to send is an empty array"""
+        self.assertEqual(self.body([]), "[]\n")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestStreamedPlaces(ViewTestCase):
+    """Test places_search streams whole result sets"""
+    def test_all_places(self):
+        """Test an empty search streams every place"""
+        places = [Place(name=str(i)) for i in range(3)]
+        for place in places:
+            place.save()
+        response = self.search({})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(sorted(place["id"] for place in response.get_json()),
+                         sorted(place.id for place in places))
+
+    def test_no_places(self):
+        """Test a search without places streams an empty array"""
+        response = self.search({"q": "nothing"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(as_text=True), "[]\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
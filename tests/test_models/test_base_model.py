@@ -8,6 +8,7 @@ import time
 import unittest
 from unittest import mock
 BaseModel = models.base_model.BaseModel
+strptime = models.base_model.strptime
 module_doc = models.base_model.__doc__
 
 
@@ -139,6 +140,48 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_datetime_from_kwargs(self):
+        """test that created_at/updated_at strings are parsed back"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        for value in (datetime(2017, 9, 28, 21, 3, 54),
+                      datetime(2017, 9, 28, 21, 3, 54, 52298)):
+            bm = BaseModel(created_at=value.strftime(t_format),
+                           updated_at=value.strftime(t_format))
+            self.assertEqual(bm.created_at, value)
+            self.assertEqual(bm.updated_at, value)
+            self.assertIsNone(bm.created_at.tzinfo)
+
+    def test_strptime_strict(self):
+        """test that strptime only accepts the format time"""
+        self.assertEqual(strptime("2017-09-28T21:03:54.052298"),
+                         datetime(2017, 9, 28, 21, 3, 54, 52298))
+        self.assertEqual(strptime("2017-9-28T21:3:54.52298"),
+                         datetime(2017, 9, 28, 21, 3, 54, 522980))
+        for value in ("2017-09-28", "2017-09-28T21:03:54",
+                      "2017-09-28 21:03:54.052298",
+                      "2017-09-28T21:03:54.052298+00:00",
+                      "20170928T210354.052298", "2017-09-28T21:03:54,052298"):
+            with self.assertRaises(ValueError):
+                strptime(value)
+
+    def test_shared_timestamps_from_kwargs(self):
+        """test that an updated_at equal to created_at is shared"""
+        bm = BaseModel(created_at="2017-09-28T21:03:54.052298",
+                       updated_at="2017-09-28T21:03:54.052298")
+        self.assertIs(bm.updated_at, bm.created_at)
+
+    def test_to_dict_datetime_format(self):
+        """test that to_dict formats datetimes like strftime would"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        for value in (datetime(2017, 9, 28, 21, 3, 54),
+                      datetime(2017, 9, 28, 21, 3, 54, 52298)):
+            bm = BaseModel()
+            bm.created_at = value
+            self.assertEqual(bm.to_dict()["created_at"],
+                             value.strftime(t_format))
+            self.assertEqual(bm.to_dict()["created_at"],
+                             value.strftime(t_format))
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -113,3 +113,17 @@ class TestCity(unittest.TestCase):
         city = City()
         string = "[City] ({}) {}".format(city.id, city.__dict__)
         self.assertEqual(string, str(city))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing File Storage")
+    def test_places(self):
+        """Test that places lists the stored places of the city"""
+        from models.place import Place
+        city = City(name="Reno")
+        place = Place(name="Loft", city_id=city.id)
+        other = Place(name="Barn", city_id="elsewhere")
+        models.storage.new(place)
+        models.storage.new(other)
+        self.assertEqual(city.places, [place])
+        models.storage.delete(place)
+        models.storage.delete(other)
+        self.assertEqual(city.places, [])
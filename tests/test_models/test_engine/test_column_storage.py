@@ -0,0 +1,150 @@
+#!/usr/bin/python3
+"""
+Contains the TestColumnStorageDocs classes
+"""
+
+import inspect
+import models
+from models.engine import column_storage
+from models.place import Place
+import pep8
+from tests.test_models.test_engine.test_file_storage import \
+    FileStorageTestCase
+import unittest
+ColumnStorage = column_storage.ColumnStorage
+
+
+class TestColumnStorageDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ColumnStorage class"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the doc tests"""
+        cls.cs_f = inspect.getmembers(ColumnStorage, inspect.isfunction)
+
+    def test_pep8_conformance_column_storage(self):
+        """Test that models/engine/column_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/column_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pep8_conformance_test_column_storage(self):
+        """Test tests/test_models/test_column_storage.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['tests/test_models/test_engine/\
+test_column_storage.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_column_storage_module_docstring(self):
+        """Test for the column_storage.py module docstring"""
+        self.assertIsNot(column_storage.__doc__, None,
+                         "column_storage.py needs a docstring")
+        self.assertTrue(len(column_storage.__doc__) >= 1,
+                        "column_storage.py needs a docstring")
+
+    def test_column_storage_class_docstring(self):
+        """Test for the ColumnStorage class docstring"""
+        self.assertIsNot(ColumnStorage.__doc__, None,
+                         "ColumnStorage class needs a docstring")
+        self.assertTrue(len(ColumnStorage.__doc__) >= 1,
+                        "ColumnStorage class needs a docstring")
+
+    def test_cs_func_docstrings(self):
+        """Test for the presence of docstrings in ColumnStorage methods"""
+        for func in self.cs_f:
+            self.assertIsNot(func[1].__doc__, None,
+                             "{:s} method needs a docstring".format(func[0]))
+            self.assertTrue(len(func[1].__doc__) >= 1,
+                            "{:s} method needs a docstring".format(func[0]))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestColumnStorage(FileStorageTestCase):
+    """Test the ColumnStorage class"""
+    def setUp(self):
+        """Start from an empty ColumnStorage"""
+        super().setUp()
+        ColumnStorage._ColumnStorage__columns.clear()
+        self.storage = ColumnStorage()
+        self.places = [Place(name=str(price), price_by_night=price,
+                             max_guest=price // 50)
+                       for price in (50, 100, 150, 200)]
+        for place in self.places:
+            self.storage.new(place)
+
+    def tearDown(self):
+        """Restore FileStorage"""
+        super().tearDown()
+        ColumnStorage._ColumnStorage__columns.clear()
+
+    def test_places_in_ranges(self):
+        """Test that places_in keeps the places between the bounds"""
+        cheap, mid, high, top = self.places
+        self.assertEqual(
+            set(self.storage.places_in(
+                ranges={"price_by_night": (100, 150)})), {mid, high})
+        self.assertEqual(
+            set(self.storage.places_in(
+                ranges={"price_by_night": (None, 100)})), {cheap, mid})
+        self.assertEqual(
+            set(self.storage.places_in(
+                ranges={"price_by_night": (None, 150),
+                        "max_guest": (3, None)})), {high})
+        self.assertEqual(len(self.storage.places_in(
+            ranges={"price_by_night": (None, None)})), 4)
+        self.assertIn("Place", ColumnStorage._ColumnStorage__columns)
+
+    def test_places_in_areas(self):
+        """Test that places_in keeps the places in box and near"""
+        cheap, mid, high, top = self.places
+        for place, latitude in zip(self.places, (10, 10.01, 20, 40)):
+            place.latitude, place.longitude = latitude, 5
+            self.storage.new(place)
+        self.assertEqual(set(self.storage.places_in(box=(0, 0, 15, 10))),
+                         {cheap, mid})
+        self.assertEqual(
+            set(self.storage.places_in(near=(10, 5, 5))), {cheap, mid})
+        self.assertEqual(
+            set(self.storage.places_in(near=(10, 5, 1))), {cheap})
+        self.assertEqual(
+            set(self.storage.places_in(
+                ranges={"price_by_night": (100, None)},
+                box=(0, 0, 30, 10))), {mid, high})
+
+    def test_places_in_follows_changes(self):
+        """Test that the columns follow new, updates and delete"""
+        cheap, mid, high, top = self.places
+        ranges = {"price_by_night": (None, 100)}
+        self.assertEqual(set(self.storage.places_in(ranges=ranges)),
+                         {cheap, mid})
+        self.storage.delete(cheap)
+        top.price_by_night = 80
+        self.storage.new(top)
+        extra = Place(name="extra", price_by_night=60)
+        self.storage.new(extra)
+        self.assertEqual(set(self.storage.places_in(ranges=ranges)),
+                         {mid, top, extra})
+
+    def test_places_in_skips_missing_values(self):
+        """Test that places without a number are never in range"""
+        place = Place(name="unknown")
+        place.latitude = None
+        self.storage.new(place)
+        places = self.storage.places_in(box=(-90, -180, 90, 180))
+        self.assertNotIn(place, places)
+        self.assertIn(self.places[0], places)
+        self.assertNotIn(place, self.storage.places_in(
+            ranges={"latitude": (None, None)}))
+
+    def test_places_in_with_other_filters(self):
+        """Test that the columns combine with the other filters"""
+        cheap, mid, high, top = self.places
+        cheap.description = "quiet loft"
+        self.storage.new(cheap)
+        self.assertEqual(self.storage.places_in(
+            ranges={"price_by_night": (None, 100)}, text="loft"), [cheap])
+        self.assertEqual(self.storage.places_in(
+            ranges={"price_by_night": (None, 100)}, limit=1),
+            sorted([cheap, mid], key=lambda place: (
+                place.created_at, place.id))[:1])
@@ -1,4 +1,3 @@
-<<<<<<< HEAD
 #!/usr/bin/python3
 """
 Contains the TestDBStorageDocs and TestDBStorage classes
@@ -6,19 +5,26 @@ Contains the TestDBStorageDocs and TestDBStorage classes
 
 from datetime import datetime
 import inspect
+import math
 import models
 from models.engine import db_storage
 from models.amenity import Amenity
-from models.base_model import BaseModel
+from models.base_model import BaseModel, Base
 from models.city import City
 from models.place import Place
 from models.review import Review
 from models.state import State
 from models.user import User
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.orm import sessionmaker, Session
 import json
 import os
 import pep8
+import tempfile
 import unittest
+from unittest.mock import patch
 from models import storage
 DBStorage = db_storage.DBStorage
 classes = {"Amenity": Amenity, "City": City, "Place": Place,
@@ -109,181 +115,375 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         c = storage.count()
         self.assertEqual(len(storage.all()), c)
-=======
-#!/usr/bin/python3
-"""
-Contains the TestDBStorageDocs and TestDBStorage classes
-"""
-
-from datetime import datetime
-import inspect
-import models
-from models.engine import db_storage
-from models.amenity import Amenity
-from models.base_model import BaseModel, Base
-from models.city import City
-from models.place import Place
-from models.review import Review
-from models.state import State
-from models.user import User
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
-import json
-import os
-import pep8
-import unittest
-DBStorage = db_storage.DBStorage
-classes = {"Amenity": Amenity, "City": City, "Place": Place,
-           "Review": Review, "State": State, "User": User}
-
-
-class TestDBStorage(unittest.TestCase):
-    """Test cases for DBStorage class"""
-
-    @classmethod
-    def setUpClass(cls):
-        """Set up for the tests"""
-        # Set environment variables for the test database
-        os.environ['HBNB_MYSQL_USER'] = 'hbnb_test'
-        os.environ['HBNB_MYSQL_PWD'] = 'hbnb_test_pwd'
-        os.environ['HBNB_MYSQL_HOST'] = 'localhost'
-        os.environ['HBNB_MYSQL_DB'] = 'hbnb_test_db'
-        os.environ['HBNB_ENV'] = 'test'
-
-        # Initialize the storage
-        cls.storage = DBStorage()
-        cls.storage.reload()
-
-    @classmethod
-    def tearDownClass(cls):
-        """Tear down after the tests"""
-        cls.storage._DBStorage__session.close()
-
-    def setUp(self):
-        """Set up for individual tests"""
-        self.session = self.storage._DBStorage__session
-
-    def tearDown(self):
-        """Clean up after individual tests"""
-        self.session.rollback()
-        for table in reversed(Base.metadata.sorted_tables):
-            self.session.execute(table.delete())
-        self.session.commit()
-
-    def test_all_returns_dict(self):
-        """Test that all returns a dictionary"""
-        self.assertIsInstance(self.storage.all(), dict)
-
-    def test_new_adds_obj(self):
-        """Test that new adds an object to the session"""
-        user = User(email="test@test.com", password="test_pwd")
-        self.storage.new(user)
-        self.assertIn(user, self.session.new)
-
-    def test_save_commits_session(self):
-        """Test that save commits the session"""
-        user = User(email="test@test.com", password="test_pwd")
-        self.storage.new(user)
-        self.storage.save()
-        self.assertNotIn(user, self.session.new)
-
-    def test_delete_removes_obj(self):
-        """Test that delete removes an object from the session"""
-        user = User(email="test@test.com", password="test_pwd")
-        self.storage.new(user)
-        self.storage.save()
-        self.storage.delete(user)
-        self.assertIn(user, self.session.deleted)
-
-    def test_reload(self):
-        """Test that reload recreates the session"""
-        self.storage.reload()
-        self.assertIsInstance(self.storage._DBStorage__session, Session)
-
-    def test_all_with_class(self):
-        """Test that all returns objects of a given class"""
-        user1 = User(email="test1@test.com", password="test_pwd")
-        user2 = User(email="test2@test.com", password="test_pwd")
-        self.storage.new(user1)
-        self.storage.new(user2)
-        self.storage.save()
-        users = self.storage.all(User)
-        self.assertEqual(len(users), 2)
-        self.assertIn(f"User.{user1.id}", users)
-        self.assertIn(f"User.{user2.id}", users)
-
-    def test_dbs_get(self):
-        """Test DBStorage get method finds specified obj in storage"""
-        obj = User()
-        obj.save()
-        self.assertEqual(self.storage.get(obj.__class__, obj.id), obj)
-
-
-class TestDBStorageDocs(unittest.TestCase):
-    """Tests to check the documentation and style of DBStorage class"""
-    @classmethod
-    def setUpClass(cls):
-        """Set up for the doc tests"""
-        cls.dbs_f = inspect.getmembers(DBStorage, inspect.isfunction)
-
-    def test_pep8_conformance_db_storage(self):
-        """Test that models/engine/db_storage.py conforms to PEP8."""
-        pep8s = pep8.StyleGuide(quiet=True)
-        result = pep8s.check_files(['models/engine/db_storage.py'])
-        self.assertEqual(result.total_errors, 0,
-                         "Found code style errors (and warnings).")
-
-    def test_pep8_conformance_test_db_storage(self):
-        """Test tests/test_models/test_db_storage.py conforms to PEP8."""
-        pep8s = pep8.StyleGuide(quiet=True)
-        result = pep8s.check_files(['tests/test_models/test_engine/\
-test_db_storage.py'])
-        self.assertEqual(result.total_errors, 0,
-                         "Found code style errors (and warnings).")
-
-    def test_db_storage_module_docstring(self):
-        """Test for the db_storage.py module docstring"""
-        self.assertIsNot(db_storage.__doc__, None,
-                         "db_storage.py needs a docstring")
-        self.assertTrue(len(db_storage.__doc__) >= 1,
-                        "db_storage.py needs a docstring")
-
-    def test_db_storage_class_docstring(self):
-        """Test for the DBStorage class docstring"""
-        self.assertIsNot(DBStorage.__doc__, None,
-                         "DBStorage class needs a docstring")
-        self.assertTrue(len(DBStorage.__doc__) >= 1,
-                        "DBStorage class needs a docstring")
-
-    def test_dbs_func_docstrings(self):
-        """Test for the presence of docstrings in DBStorage methods"""
-        for func in self.dbs_f:
-            self.assertIsNot(func[1].__doc__, None,
-                             "{:s} method needs a docstring".format(func[0]))
-            self.assertTrue(len(func[1].__doc__) >= 1,
-                            "{:s} method needs a docstring".format(func[0]))
-
-
-class TestFileStorage(unittest.TestCase):
-    """Test the FileStorage class"""
-    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
-    def test_all_returns_dict(self):
-        """Test that all returns a dictionaty"""
-        self.assertIs(type(models.storage.all()), dict)
-
-    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
-    def test_all_no_class(self):
-        """Test that all returns all rows when no class is passed"""
-
-    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
-    def test_new(self):
-        """test that new adds an object to the database"""
-
-    @unittest.skipIf(models.storage_t != 'db', "not testing db storage")
-    def test_save(self):
-        """Test that save properly saves objects to file.json"""
-
-
-if __name__ == '__main__':
-    unittest.main()
->>>>>>> 8ccf1ad752188b67c8e49134b6a766b15f525575
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestDBStorage(unittest.TestCase):
+    """Test cases for DBStorage class"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up for the tests"""
+        # Set environment variables for the test database
+        os.environ['HBNB_MYSQL_USER'] = 'hbnb_test'
+        os.environ['HBNB_MYSQL_PWD'] = 'hbnb_test_pwd'
+        os.environ['HBNB_MYSQL_HOST'] = 'localhost'
+        os.environ['HBNB_MYSQL_DB'] = 'hbnb_test_db'
+        os.environ['HBNB_ENV'] = 'test'
+
+        # Initialize the storage
+        cls.storage = DBStorage()
+        cls.storage.reload()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Tear down after the tests"""
+        cls.storage._DBStorage__session.close()
+
+    def setUp(self):
+        """Set up for individual tests"""
+        self.session = self.storage._DBStorage__session
+
+    def tearDown(self):
+        """Clean up after individual tests"""
+        self.session.rollback()
+        for table in reversed(Base.metadata.sorted_tables):
+            self.session.execute(table.delete())
+        self.session.commit()
+
+    def test_all_returns_dict(self):
+        """Test that all returns a dictionary"""
+        self.assertIsInstance(self.storage.all(), dict)
+
+    def test_new_adds_obj(self):
+        """Test that new adds an object to the session"""
+        user = User(email="test@test.com", password="test_pwd")
+        self.storage.new(user)
+        self.assertIn(user, self.session.new)
+
+    def test_save_commits_session(self):
+        """Test that save commits the session"""
+        user = User(email="test@test.com", password="test_pwd")
+        self.storage.new(user)
+        self.storage.save()
+        self.assertNotIn(user, self.session.new)
+
+    def test_delete_removes_obj(self):
+        """Test that delete removes an object from the session"""
+        user = User(email="test@test.com", password="test_pwd")
+        self.storage.new(user)
+        self.storage.save()
+        self.storage.delete(user)
+        self.assertIn(user, self.session.deleted)
+
+    def test_reload(self):
+        """Test that reload recreates the session"""
+        self.storage.reload()
+        self.assertIsInstance(self.storage._DBStorage__session(), Session)
+
+    def test_all_with_class(self):
+        """Test that all returns objects of a given class"""
+        user1 = User(email="test1@test.com", password="test_pwd")
+        user2 = User(email="test2@test.com", password="test_pwd")
+        self.storage.new(user1)
+        self.storage.new(user2)
+        self.storage.save()
+        users = self.storage.all(User)
+        self.assertEqual(len(users), 2)
+        self.assertIn(f"User.{user1.id}", users)
+        self.assertIn(f"User.{user2.id}", users)
+
+    def test_dbs_get(self):
+        """Test DBStorage get method finds specified obj in storage"""
+        obj = User(email="test@test.com", password="test_pwd")
+        self.storage.new(obj)
+        self.storage.save()
+        self.assertEqual(self.storage.get(obj.__class__, obj.id), obj)
+
+
+@unittest.skipIf(models.storage_t != 'db', "not testing db storage")
+class TestDBStorageSQLite(unittest.TestCase):
+    """Test the queries of DBStorage on an in-memory SQLite database"""
+    def setUp(self):
+        """Point a DBStorage at an empty SQLite database"""
+        with patch.dict(os.environ, {"HBNB_ENV": ""}):
+            self.storage = DBStorage()
+        engine = create_engine("sqlite://")
+
+        @event.listens_for(engine, "connect")
+        def functions(connection, record):
+            """adds the math functions SQLite may be built without"""
+            for name, func in (("radians", math.radians), ("sin", math.sin),
+                               ("cos", math.cos), ("asin", math.asin),
+                               ("sqrt", math.sqrt), ("power", math.pow)):
+                connection.create_function(name, 1 + (name == "power"),
+                                           func)
+
+        self.storage._DBStorage__engine = engine
+        self.storage.reload()
+        self.user = User(email="a@b.c", password="pwd")
+        self.ca = State(name="California")
+        self.nv = State(name="Nevada")
+        self.sf = City(name="San Francisco", state_id=self.ca.id)
+        self.reno = City(name="Reno", state_id=self.nv.id)
+        for obj in (self.user, self.ca, self.nv, self.sf, self.reno):
+            self.storage.new(obj)
+        self.storage.save()
+
+    def tearDown(self):
+        """Close the session"""
+        self.storage.close()
+
+    def place(self, city, **kwargs):
+        """Saves and returns a place of city"""
+        place = Place(city_id=city.id, user_id=self.user.id, **kwargs)
+        self.storage.new(place)
+        self.storage.save()
+        return place
+
+    def test_reload_creates_indexes(self):
+        """Test that reload creates every table and its indexes"""
+        tables = Base.metadata.tables
+        names = set(self.storage._DBStorage__engine.dialect.get_table_names(
+            self.storage._DBStorage__session.connection()))
+        self.assertEqual(names, set(tables))
+        indexes = {index["name"] for index in
+                   self.storage._DBStorage__engine.dialect.get_indexes(
+                       self.storage._DBStorage__session.connection(),
+                       "places")}
+        self.assertIn("ix_places_price_by_night", indexes)
+        self.assertIn("ix_places_latitude_longitude", indexes)
+
+    def test_timestamps_keep_microseconds(self):
+        """Test that timestamps are DATETIME(6) in MySQL, so ETags change
+        on saves within the same second"""
+        for name in ("created_at", "updated_at"):
+            for table in Base.metadata.sorted_tables:
+                if name in table.c:
+                    self.assertEqual(table.c[name].type.compile(
+                        dialect=mysql.dialect()), "DATETIME(6)")
+        self.ca.updated_at = self.ca.updated_at.replace(microsecond=123456)
+        self.storage.save()
+        self.storage._DBStorage__session.expunge_all()
+        self.assertEqual(self.storage.get(State, self.ca.id)
+                         .updated_at.microsecond, 123456)
+
+    def test_version(self):
+        """Test that version changes with the rows of its class, without
+        querying the database"""
+        selects = []
+        event.listen(self.storage._DBStorage__engine, "before_execute",
+                     lambda *args: selects.append(args[1]))
+        before = (self.storage.version(State), self.storage.version(City),
+                  self.storage.version())
+        self.assertEqual(selects, [])
+        self.storage.new(State(name="Oregon"))
+        self.storage.save()
+        selects.clear()
+        self.assertNotEqual(self.storage.version(State), before[0])
+        self.assertEqual(self.storage.version(City), before[1])
+        self.assertNotEqual(self.storage.version(), before[2])
+        self.assertEqual(selects, [])
+        before = self.storage.version("State")
+        self.assertEqual(self.storage.version(State), before)
+        self.ca.name = "Golden State"
+        self.storage.save()
+        self.assertNotEqual(self.storage.version(State), before)
+        before = self.storage.version(City)
+        self.storage.delete(self.reno)
+        self.storage.save()
+        self.assertNotEqual(self.storage.version(City), before)
+
+    def test_places_in(self):
+        """Test that places_in gathers places of states and cities once"""
+        loft = self.place(self.sf, name="Loft")
+        barn = self.place(self.reno, name="Barn")
+        self.assertEqual(self.storage.places_in([self.ca.id], [self.sf.id]),
+                         [loft])
+        self.assertEqual(self.storage.places_in([], [self.reno.id]), [barn])
+        self.assertEqual(set(self.storage.places_in()), {loft, barn})
+
+    def test_places_in_amenities(self):
+        """Test that places_in keeps places having every amenity"""
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        loft = self.place(self.sf, name="Loft")
+        barn = self.place(self.reno, name="Barn")
+        loft.amenities.extend([wifi, pool])
+        barn.amenities.append(wifi)
+        self.storage.save()
+        self.assertEqual(set(self.storage.places_in(amenities=[wifi.id])),
+                         {loft, barn})
+        self.assertEqual(self.storage.places_in(
+            amenities=[pool.id, wifi.id, pool.id]), [loft])
+        self.assertEqual(self.storage.places_in(
+            cities=[self.reno.id], amenities=[pool.id]), [])
+        self.assertEqual(self.storage.places_in(amenities=["nope"]), [])
+
+    def test_places_in_ranges(self):
+        """Test that places_in keeps places within every range"""
+        loft = self.place(self.sf, name="Loft", price_by_night=120,
+                          max_guest=2)
+        barn = self.place(self.reno, name="Barn", price_by_night=80,
+                          max_guest=6)
+        self.assertEqual(self.storage.places_in(
+            ranges={"price_by_night": (None, 100)}), [barn])
+        self.assertEqual(self.storage.places_in(
+            ranges={"price_by_night": (50, 150), "max_guest": (4, None)}),
+            [barn])
+        self.assertEqual(self.storage.places_in(
+            cities=[self.sf.id], ranges={"max_guest": (4, None)}), [])
+        self.assertEqual(self.storage.range(Place, "price_by_night", 100),
+                         [loft])
+
+    def test_places_in_area(self):
+        """Test that places_in keeps places in the box and radius"""
+        loft = self.place(self.sf, name="Loft", latitude=37.77,
+                          longitude=-122.42)
+        barn = self.place(self.reno, name="Barn", latitude=39.53,
+                          longitude=-119.81)
+        hut = self.place(self.reno, name="Hut", latitude=-17.7,
+                         longitude=179.9)
+        self.place(self.reno, name="Nowhere")
+        self.assertEqual(self.storage.places_in(box=(37, -123, 38, -122)),
+                         [loft])
+        self.assertEqual(set(self.storage.places_in(near=(38.5, -121, 350))),
+                         {loft, barn})
+        self.assertEqual(self.storage.places_in(near=(38.5, -121, 100)), [])
+        self.assertEqual(self.storage.places_in(box=(-20, 179, -15, -179)),
+                         [hut])
+
+    def test_places_in_text(self):
+        """Test that places_in matches words of places and their reviews"""
+        loft = self.place(self.sf, name="Sunny Loft",
+                          description="Close to the bay")
+        barn = self.place(self.reno, name="Old Barn",
+                          description="Quiet countryside")
+        review = Review(place_id=loft.id, user_id=self.user.id,
+                        text="Great view of the bridge")
+        self.storage.new(review)
+        self.storage.save()
+        self.assertEqual(self.storage.places_in(text="barn"), [barn])
+        self.assertEqual(self.storage.places_in(text="COUNTRY qui"), [barn])
+        self.assertEqual(self.storage.places_in(text="bridge"), [loft])
+        self.assertEqual(self.storage.places_in(text="bridge barn"), [])
+        self.assertEqual(len(self.storage.places_in(text="?")), 2)
+
+    def test_iter_places_in(self):
+        """Test that iter_places_in yields the places of places_in"""
+        loft = self.place(self.sf, name="Loft", price_by_night=100)
+        self.place(self.sf, name="Barn", price_by_night=10)
+        places = self.storage.iter_places_in(
+            cities=[self.sf.id], ranges={"price_by_night": (50, None)})
+        self.assertNotIsInstance(places, list)
+        self.assertEqual(list(places), [loft])
+
+    def test_iter_all_in_batches(self):
+        """Test that iter_all reads __batch rows at a time and only holds
+        the objects of the current batch"""
+        ids = sorted((place.created_at, place.id) for place in
+                     [self.place(self.sf, name=str(i)) for i in range(5)])
+        session = self.storage._DBStorage__session
+        session.expunge_all()
+        selects = []
+        event.listen(self.storage._DBStorage__engine, "before_execute",
+                     lambda *args: selects.append(args[1]))
+        with patch.object(DBStorage, "_DBStorage__batch", 2):
+            places = self.storage.iter_all(Place)
+            self.assertEqual(selects, [])
+            first = next(places)
+            self.assertEqual(len(selects), 1)
+            held = [obj for obj in session.identity_map.values()
+                    if isinstance(obj, Place)]
+            self.assertLessEqual(len(held), 2)
+            rest = list(places)
+        self.assertEqual([(place.created_at, place.id)
+                          for place in [first] + rest], ids)
+        self.assertEqual(len(selects), 3)
+
+    def test_places_in_page(self):
+        """Test that places_in pages by (created_at, id)"""
+        places = [self.place(self.sf, name=str(i), price_by_night=i,
+                             created_at="2024-01-0{}T00:00:00.000000"
+                             .format(i))
+                  for i in range(1, 5)]
+        first = self.storage.places_in(limit=2)
+        self.assertEqual(first, places[:2])
+        after = (first[-1].created_at.isoformat(timespec="microseconds"),
+                 first[-1].id)
+        self.assertEqual(self.storage.places_in(limit=2, after=after),
+                         places[2:])
+        self.assertEqual(self.storage.places_in(
+            limit=1, after=after, ranges={"price_by_night": (4, None)}),
+            places[3:])
+
+
+class TestInstrumentedPool(unittest.TestCase):
+    """Test the counters of InstrumentedPool on a SQLite file"""
+    def setUp(self):
+        """Open an engine whose pool holds a single connection"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.engine = create_engine(
+            "sqlite:///" + os.path.join(self.directory.name, "pool.db"),
+            poolclass=db_storage.InstrumentedPool, pool_size=1,
+            max_overflow=0, pool_timeout=0.1)
+        self.pool = self.engine.pool
+
+    def tearDown(self):
+        """Close the engine and remove its file"""
+        self.engine.dispose()
+        self.directory.cleanup()
+
+    def test_stats(self):
+        """Test checkouts, waits and timeouts are counted"""
+        stats = self.pool.stats()
+        self.assertEqual((stats["pool_size"], stats["max_overflow"],
+                          stats["checkouts"], stats["waits"],
+                          stats["timeouts"]), (1, 0, 0, 0, 0))
+        connection = self.engine.connect()
+        stats = self.pool.stats()
+        self.assertEqual((stats["checkouts"], stats["waits"],
+                          stats["checked_out"]), (1, 0, 1))
+        with self.assertRaises(PoolTimeout):
+            self.engine.connect()
+        stats = self.pool.stats()
+        self.assertEqual((stats["checkouts"], stats["waits"],
+                          stats["timeouts"]), (2, 1, 1))
+        connection.close()
+        self.engine.connect().close()
+        stats = self.pool.stats()
+        self.assertEqual((stats["checkouts"], stats["waits"],
+                          stats["timeouts"], stats["checked_out"],
+                          stats["checked_in"]), (3, 1, 1, 0, 1))
+
+    def test_latency(self):
+        """Test every checkout falls in a cumulative latency bucket"""
+        for i in range(3):
+            self.engine.connect().close()
+        seconds = self.pool.stats()["checkout_seconds"]
+        self.assertEqual(seconds["count"], 3)
+        self.assertEqual(seconds["buckets"]["+Inf"], 3)
+        counts = list(seconds["buckets"].values())
+        self.assertEqual(counts, sorted(counts))
+        self.assertGreaterEqual(seconds["sum"], 0)
+
+
+class TestFlag(unittest.TestCase):
+    """Test the parsing of boolean environment variables"""
+    def test_flag(self):
+        """Test true, false and invalid values"""
+        for value, expected in (("1", True), ("true", True), ("Yes", True),
+                                ("on", True), ("", False), ("0", False),
+                                ("false", False), ("No", False),
+                                ("off", False)):
+            with patch.dict(os.environ, {"HBNB_TEST_FLAG": value}):
+                self.assertIs(db_storage.flag("HBNB_TEST_FLAG"), expected)
+        os.environ.pop("HBNB_TEST_FLAG", None)
+        self.assertIs(db_storage.flag("HBNB_TEST_FLAG"), False)
+        with patch.dict(os.environ, {"HBNB_TEST_FLAG": "maybe"}):
+            with self.assertRaises(ValueError):
+                db_storage.flag("HBNB_TEST_FLAG")
+
+
+if __name__ == '__main__':
+    unittest.main()
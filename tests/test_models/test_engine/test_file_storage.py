@@ -1,11 +1,12 @@
-<<<<<<< HEAD
 #!/usr/bin/python3
 """
 Contains the TestFileStorageDocs classes
 """
 
 from datetime import datetime
+from hashlib import sha256
 import inspect
+import io
 import models
 from models.engine import file_storage
 from models.amenity import Amenity
@@ -19,6 +20,7 @@ import json
 import os
 import pep8
 import unittest
+from unittest.mock import patch
 FileStorage = file_storage.FileStorage
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
@@ -69,8 +71,65 @@ test_file_storage.py'])
                             "{:s} method needs a docstring".format(func[0]))
 
 
+class FileStorageTestCase(unittest.TestCase):
+    """Runs each test on an empty FileStorage, putting back the objects,
+    indexes and settings of the class afterwards"""
+    # class attributes of FileStorage holding objects and indexes
+    state = ("objects", "by_class", "dirty", "pending", "children",
+             "parents", "places_with", "amenities_of", "sorted",
+             "sort_keys", "ranked", "ranks", "grid", "cells", "postings",
+             "vocabulary", "words_of", "versions")
+    # class attributes of FileStorage a test may change
+    settings = ("indexed", "file_path", "journal", "compact_at",
+                "journaled", "checksum", "signature", "lazy", "gridded",
+                "worded", "interned")
+    # boolean settings turned off whatever the environment says
+    features = ("journal", "checksum", "lazy", "interned")
+    # file the test saves to, removed with its journal and lock afterwards
+    file_path = None
+
+    def setUp(self):
+        """Empty FileStorage"""
+        self.saved = {name: getattr(FileStorage, "_FileStorage__" + name)
+                      for name in self.state + self.settings}
+        for name in self.features:
+            setattr(FileStorage, "_FileStorage__" + name, False)
+        if self.file_path is not None:
+            FileStorage._FileStorage__file_path = self.file_path
+        for name in self.state:
+            setattr(FileStorage, "_FileStorage__" + name,
+                    type(self.saved[name])())
+        FileStorage._FileStorage__indexed = None
+        FileStorage._FileStorage__journaled = 0
+        FileStorage._FileStorage__signature = None
+        FileStorage._FileStorage__gridded = False
+        FileStorage._FileStorage__worded = False
+        self.storage = FileStorage()
+
+    def tearDown(self):
+        """Restore FileStorage and remove the files written"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+        if self.file_path is not None:
+            for suffix in ("", ".journal", ".lock"):
+                if os.path.exists(self.file_path + suffix):
+                    os.remove(self.file_path + suffix)
+
+
 class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
+    def setUp(self):
+        """Turn off the features changing what save() writes"""
+        self.saved = {name: getattr(FileStorage, "_FileStorage__" + name)
+                      for name in FileStorageTestCase.features}
+        for name in self.saved:
+            setattr(FileStorage, "_FileStorage__" + name, False)
+
+    def tearDown(self):
+        """Restore the features"""
+        for name, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_all_returns_dict(self):
         """Test that all returns the FileStorage.__objects attr"""
@@ -140,138 +199,603 @@ class TestFileStorage(unittest.TestCase):
         storage.save()
         c = storage.count()
         self.assertEqual(len(storage.all()), c)
-=======
-#!/usr/bin/python3
-"""
-Contains the TestFileStorageDocs classes
-"""
-
-from datetime import datetime
-import inspect
-import models
-from models.engine import file_storage
-from models.amenity import Amenity
-from models.base_model import BaseModel
-from models.city import City
-from models.place import Place
-from models.review import Review
-from models.state import State
-from models.user import User
-import json
-import os
-import pep8
-import unittest
-FileStorage = file_storage.FileStorage
-classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
-           "Place": Place, "Review": Review, "State": State, "User": User}
-
-
-class TestFileStorageDocs(unittest.TestCase):
-    """Tests to check the documentation and style of FileStorage class"""
-    @classmethod
-    def setUpClass(cls):
-        """Set up for the doc tests"""
-        cls.fs_f = inspect.getmembers(FileStorage, inspect.isfunction)
-
-    def test_pep8_conformance_file_storage(self):
-        """Test that models/engine/file_storage.py conforms to PEP8."""
-        pep8s = pep8.StyleGuide(quiet=True)
-        result = pep8s.check_files(['models/engine/file_storage.py'])
-        self.assertEqual(result.total_errors, 0,
-                         "Found code style errors (and warnings).")
-
-    def test_pep8_conformance_test_file_storage(self):
-        """Test tests/test_models/test_file_storage.py conforms to PEP8."""
-        pep8s = pep8.StyleGuide(quiet=True)
-        result = pep8s.check_files(['tests/test_models/test_engine/\
-test_file_storage.py'])
-        self.assertEqual(result.total_errors, 0,
-                         "Found code style errors (and warnings).")
-
-    def test_file_storage_module_docstring(self):
-        """Test for the file_storage.py module docstring"""
-        self.assertIsNot(file_storage.__doc__, None,
-                         "file_storage.py needs a docstring")
-        self.assertTrue(len(file_storage.__doc__) >= 1,
-                        "file_storage.py needs a docstring")
-
-    def test_file_storage_class_docstring(self):
-        """Test for the FileStorage class docstring"""
-        self.assertIsNot(FileStorage.__doc__, None,
-                         "FileStorage class needs a docstring")
-        self.assertTrue(len(FileStorage.__doc__) >= 1,
-                        "FileStorage class needs a docstring")
-
-    def test_fs_func_docstrings(self):
-        """Test for the presence of docstrings in FileStorage methods"""
-        for func in self.fs_f:
-            self.assertIsNot(func[1].__doc__, None,
-                             "{:s} method needs a docstring".format(func[0]))
-            self.assertTrue(len(func[1].__doc__) >= 1,
-                            "{:s} method needs a docstring".format(func[0]))
-
-
-class TestFileStorage(unittest.TestCase):
-    """Test the FileStorage class"""
-    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
-    def test_all_returns_dict(self):
-        """Test that all returns the FileStorage.__objects attr"""
-        storage = FileStorage()
-        new_dict = storage.all()
-        self.assertEqual(type(new_dict), dict)
-        self.assertIs(new_dict, storage._FileStorage__objects)
-
-    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
-    def test_new(self):
-        """test that new adds an object to the FileStorage.__objects attr"""
-        storage = FileStorage()
-        save = FileStorage._FileStorage__objects
-        FileStorage._FileStorage__objects = {}
-        test_dict = {}
-        for key, value in classes.items():
-            with self.subTest(key=key, value=value):
-                instance = value()
-                instance_key = instance.__class__.__name__ + "." + instance.id
-                storage.new(instance)
-                test_dict[instance_key] = instance
-                self.assertEqual(test_dict, storage._FileStorage__objects)
-        FileStorage._FileStorage__objects = save
-
-    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
-    def test_get(self):
-        """Test that get returns the correct object"""
-        storage = FileStorage()
-        new_state = State(name="Test")
-        storage.new(new_state)
-        storage.save()
-        state_id = list(storage.all(State).values())[0].id
-        self.assertIsNotNone(storage.get(State, state_id))
-        self.assertIsNone(storage.get(State, '10'))
-
-    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
-    def test_count(self):
-        """Test that count returns the correct number"""
-        Fstorage = FileStorage()
-        self.assertEqual(Fstorage.count(), len(Fstorage.all()))
-        self.assertEqual(Fstorage.count(State), len(Fstorage.all(State)))
-
-    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
-    def test_save(self):
-        """Test that save properly saves objects to file.json"""
-        storage = FileStorage()
-        new_dict = {}
-        for key, value in classes.items():
-            instance = value()
-            instance_key = instance.__class__.__name__ + "." + instance.id
-            new_dict[instance_key] = instance
-        save = FileStorage._FileStorage__objects
-        FileStorage._FileStorage__objects = new_dict
-        storage.save()
-        FileStorage._FileStorage__objects = save
-        for key, value in new_dict.items():
-            new_dict[key] = value.to_dict()
-        string = json.dumps(new_dict)
-        with open("file.json", "r") as f:
-            js = f.read()
-        self.assertEqual(json.loads(string), json.loads(js))
->>>>>>> 8ccf1ad752188b67c8e49134b6a766b15f525575
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get_missing(self):
+        """Test that get returns None for an unknown id"""
+        storage = FileStorage()
+        new_state = State(name="Test")
+        storage.new(new_state)
+        self.assertIsNotNone(storage.get(State, new_state.id))
+        self.assertIsNone(storage.get(State, '10'))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_count_by_class(self):
+        """Test that count returns the correct number"""
+        Fstorage = FileStorage()
+        self.assertEqual(Fstorage.count(), len(Fstorage.all()))
+        self.assertEqual(Fstorage.count(State), len(Fstorage.all(State)))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_counts(self):
+        """Test that counts returns the size of every class"""
+        storage = FileStorage()
+        counts = storage.counts()
+        self.assertEqual(set(counts), set(classes))
+        for name, cls in classes.items():
+            self.assertEqual(counts[name], storage.count(name))
+            if cls is not BaseModel:
+                self.assertEqual(counts[name], storage.count(cls))
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageJournal(FileStorageTestCase):
+    """Test the append-only journal mode of FileStorage"""
+    file_path = "test_journal.json"
+
+    def setUp(self):
+        """Point FileStorage at an empty file with the journal enabled"""
+        super().setUp()
+        self.storage.save()
+        FileStorage._FileStorage__journal = True
+
+    def reloaded(self):
+        """Return a fresh copy of the objects read back from disk"""
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        return self.storage.all()
+
+    def test_save_appends(self):
+        """Test that save appends changes instead of rewriting the file"""
+        state = State(name="Texas")
+        state.save()
+        with open("test_journal.json", "r") as f:
+            self.assertEqual(json.load(f), {})
+        with open("test_journal.json.journal", "r") as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(self.reloaded()["State." + state.id].name, "Texas")
+
+    def test_replay_update_and_delete(self):
+        """Test that reload replays updates and deletions in order"""
+        state = State(name="Texas")
+        city = City(name="Austin", state_id=state.id)
+        self.storage.new(state)
+        self.storage.new(city)
+        self.storage.save()
+        state.name = "Utah"
+        state.save()
+        self.storage.delete(city)
+        self.storage.save()
+        objs = self.reloaded()
+        self.assertEqual(list(objs), ["State." + state.id])
+        self.assertEqual(objs["State." + state.id].name, "Utah")
+        self.assertEqual(self.storage.count(City), 0)
+
+    def test_torn_record(self):
+        """Test that records appended after a torn one survive a restart"""
+        a = State(name="A")
+        a.save()
+        with open("test_journal.json.journal", "a") as f:
+            f.write('["State.torn", {"__class__": "Sta')
+        self.reloaded()
+        b = State(name="B")
+        b.save()
+        c = State(name="C")
+        c.save()
+        self.assertEqual(set(self.reloaded()),
+                         {"State." + obj.id for obj in (a, b, c)})
+        with open("test_journal.json.journal", "r") as f:
+            self.assertEqual(len(f.readlines()), 3)
+
+    def test_compaction(self):
+        """Test that the journal is folded into the snapshot"""
+        compact_at = FileStorage._FileStorage__compact_at
+        FileStorage._FileStorage__compact_at = 3
+        try:
+            states = [State(name=str(i)) for i in range(4)]
+            for state in states:
+                state.save()
+        finally:
+            FileStorage._FileStorage__compact_at = compact_at
+        with open("test_journal.json", "r") as f:
+            self.assertEqual(len(json.load(f)), 3)
+        with open("test_journal.json.journal", "r") as f:
+            self.assertEqual(len(f.readlines()), 1)
+        self.assertEqual(len(self.reloaded()), 4)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageSnapshot(FileStorageTestCase):
+    """Test the atomic, checksummed snapshots of FileStorage"""
+    file_path = "test_snapshot.json"
+
+    def setUp(self):
+        """Point FileStorage at an empty file with checksums enabled"""
+        super().setUp()
+        FileStorage._FileStorage__checksum = True
+
+    def test_checksum_round_trip(self):
+        """Test that a checksummed snapshot reloads and leaves no temp"""
+        state = State(name="Ohio")
+        self.storage.new(state)
+        self.storage.save()
+        with open("test_snapshot.json", "r") as f:
+            self.assertTrue(f.readline().startswith("#sha256 "))
+        self.assertEqual([name for name in os.listdir(".")
+                          if name.startswith(".file.json.")], [])
+        FileStorage._FileStorage__objects = {}
+        self.storage.reload()
+        self.assertEqual(self.storage.get(State, state.id).name, "Ohio")
+
+    def test_checksum_mismatch(self):
+        """Test that reload refuses a file whose checksum does not match"""
+        self.storage.new(State(name="Ohio"))
+        self.storage.save()
+        with open("test_snapshot.json", "r") as f:
+            text = f.read()
+        with open("test_snapshot.json", "w") as f:
+            f.write(text.replace("Ohio", "Iowa"))
+        with self.assertRaises(ValueError):
+            self.storage.reload()
+
+    def test_close_skips_unchanged_file(self):
+        """Test that close only reloads when the file changed on disk"""
+        state = State(name="Ohio")
+        self.storage.new(state)
+        self.storage.save()
+        state.name = "Iowa"
+        self.storage.close()
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.assertEqual(state.name, "Iowa")
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageShared(FileStorageTestCase):
+    """Test FileStorage files shared by several processes"""
+    file_path = "test_shared.json"
+
+    def test_close_drops_deleted(self):
+        """Test that objects deleted by another process stay deleted"""
+        kept = State(name="Kept")
+        gone = State(name="Gone")
+        self.storage.new(kept)
+        self.storage.new(gone)
+        self.storage.save()
+        with open("test_shared.json", "r") as f:
+            objs = json.load(f)
+        del objs["State." + gone.id]
+        with open("test_shared.json", "w") as f:
+            json.dump(objs, f)
+        self.storage.close()
+        self.assertIsNone(self.storage.get(State, gone.id))
+        self.assertEqual(self.storage.count(State), 1)
+        State(name="New").save()
+        with open("test_shared.json", "r") as f:
+            self.assertNotIn("State." + gone.id, json.load(f))
+
+    def test_concurrent_saves(self):
+        """Test that processes saving at the same time lose no object"""
+        for journal in (False, True):
+            FileStorage._FileStorage__journal = journal
+            children = []
+            for worker in range(3):
+                pid = os.fork()
+                if pid == 0:
+                    try:
+                        for i in range(10):
+                            State(name="{}-{}".format(worker, i)).save()
+                    finally:
+                        os._exit(0)
+                children.append(pid)
+            for pid in children:
+                os.waitpid(pid, 0)
+            self.storage.reload()
+            with self.subTest(journal=journal):
+                self.assertEqual(self.storage.count(State), 30)
+            for state in list(self.storage.all(State).values()):
+                self.storage.delete(state)
+            self.storage.save()
+
+    def test_same_stat(self):
+        """Test that a save by another process is seen even when the files
+        keep the inode, size and mtime this process last saw"""
+        state = State(name="Ohio")
+        self.storage.new(state)
+        self.storage.save()
+        st = os.stat("test_shared.json")
+
+        def same_stat(path):
+            """returns the stat of the file as saved, without journal"""
+            if path.endswith(".journal"):
+                raise FileNotFoundError(path)
+            return st
+
+        with patch.object(file_storage, "stat", same_stat):
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    FileStorage._FileStorage__dirty = {}
+                    self.storage.reload()
+                    self.storage.get(State, state.id).name = "Iowa"
+                    self.storage.save()
+                finally:
+                    os._exit(0)
+            os.waitpid(pid, 0)
+            State(name="Utah").save()
+        with open("test_shared.json", "r") as f:
+            objs = json.load(f)
+        self.assertEqual(objs["State." + state.id]["name"], "Iowa")
+        self.assertEqual(len(objs), 2)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageStreaming(unittest.TestCase):
+    """Test the incremental JSON reader used by FileStorage.reload"""
+    def items(self, text, chunk_size):
+        """Return the pairs read from text, chunk_size characters a time"""
+        storage = FileStorage()
+        return list(storage._FileStorage__items(io.StringIO(text), sha256(),
+                                                chunk_size))
+
+    def test_items_match_json_load(self):
+        """Test that any chunk size yields what json.loads returns"""
+        objs = {}
+        for value in classes.values():
+            instance = value(name='a "quoted" }, name')
+            objs[instance.__class__.__name__ + "." + instance.id] = \
+                instance.to_dict()
+        for text in (json.dumps(objs), json.dumps(objs, indent=2)):
+            for chunk_size in (1, 7, 64, 65536):
+                with self.subTest(chunk_size=chunk_size):
+                    self.assertEqual(self.items(text, chunk_size),
+                                     list(objs.items()))
+
+    def test_items_empty(self):
+        """Test that an empty file or object yields nothing"""
+        self.assertEqual(self.items("", 4), [])
+        self.assertEqual(self.items(" { } ", 1), [])
+
+    def test_items_truncated(self):
+        """Test that a truncated file raises instead of loading half"""
+        text = json.dumps({"State.1": {"__class__": "State", "id": "1"},
+                           "State.2": {"__class__": "State", "id": "2"}})
+        with self.assertRaises(ValueError):
+            self.items(text[:-10], 8)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageLazy(FileStorageTestCase):
+    """Test the lazy reload mode of FileStorage"""
+    file_path = "test_lazy.json"
+
+    def setUp(self):
+        """Save a few objects to a file and reload it lazily"""
+        super().setUp()
+        self.state = State(name="Nevada")
+        self.city = City(name="Reno", state_id=self.state.id)
+        self.storage.new(self.state)
+        self.storage.new(self.city)
+        self.storage.save()
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__lazy = True
+        self.storage.reload()
+
+    def test_count_without_hydrating(self):
+        """Test that counting does not instantiate anything"""
+        self.assertEqual(self.storage.count(), 2)
+        self.assertEqual(self.storage.counts()["City"], 1)
+        self.assertEqual(self.storage._FileStorage__objects, {})
+
+    def test_hydrate_on_access(self):
+        """Test that objects are instantiated once, when accessed"""
+        state = self.storage.get(State, self.state.id)
+        self.assertEqual(state.name, "Nevada")
+        self.assertEqual(list(self.storage._FileStorage__objects),
+                         ["State." + self.state.id])
+        self.assertIs(self.storage.get(State, self.state.id), state)
+        self.assertIs(self.storage.all(State)["State." + state.id], state)
+        self.assertEqual(len(self.storage.all()), 2)
+        self.assertEqual(self.storage.count(), 2)
+
+    def test_iter_all(self):
+        """Test that iter_all instantiates objects as they are reached"""
+        states = self.storage.iter_all(State)
+        self.assertEqual(self.storage._FileStorage__objects, {})
+        self.assertEqual([state.id for state in states], [self.state.id])
+        self.assertEqual(list(self.storage._FileStorage__objects),
+                         ["State." + self.state.id])
+
+    def test_save_pending(self):
+        """Test that save writes objects that were never accessed"""
+        self.storage.delete(self.storage.get(State, self.state.id))
+        self.storage.save()
+        with open("test_lazy.json", "r") as f:
+            self.assertEqual(list(json.load(f)), ["City." + self.city.id])
+
+    def test_save_after_external_write(self):
+        """Test that a change saved after another process wrote the file
+        replaces the dict still pending for it"""
+        state = self.storage.get(State, self.state.id)
+        state.name = "Carson"
+        self.storage.new(state)
+        with open("test_lazy.json", "r") as f:
+            objs = json.load(f)
+        other = State(name="Utah")
+        objs["State." + other.id] = other.to_dict()
+        with open("test_lazy.json", "w") as f:
+            json.dump(objs, f)
+        self.storage.save()
+        self.assertEqual(self.storage.count(State), 2)
+        self.assertIs(self.storage.get(State, state.id), state)
+        self.assertEqual(state.name, "Carson")
+        with open("test_lazy.json", "r") as f:
+            objs = json.load(f)
+        self.assertEqual(objs["State." + state.id]["name"], "Carson")
+        self.assertIn("State." + other.id, objs)
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageIntern(FileStorageTestCase):
+    """Test the interning of ids when reloading"""
+    file_path = "test_intern.json"
+
+    def setUp(self):
+        """Write reviews of one place, each with its own copy of the ids"""
+        super().setUp()
+        place_id, user_id = "place-1234", "user-1234"
+        self.reviews = {}
+        for i in range(2):
+            review = Review(text=str(i), place_id=place_id, user_id=user_id,
+                            other_id="other-1234",
+                            amenity_ids=["amenity-1234"])
+            self.reviews["Review." + review.id] = review.to_dict()
+        with open("test_intern.json", "w") as f:
+            json.dump(self.reviews, f)
+
+    def reloaded(self, interned, lazy=False):
+        """Returns the dicts of the two reviews reloaded"""
+        FileStorage._FileStorage__interned = interned
+        FileStorage._FileStorage__lazy = lazy
+        self.storage.reload()
+        return [self.storage.all(Review)[key].__dict__
+                for key in self.reviews]
+
+    def test_interned(self):
+        """Test the ids of other objects are shared once interned"""
+        for lazy in (False, True):
+            first, second = self.reloaded(True, lazy)
+            self.assertEqual(first["place_id"], "place-1234")
+            self.assertIs(first["place_id"], second["place_id"])
+            self.assertIs(first["user_id"], second["user_id"])
+            self.assertIs(first["amenity_ids"][0],
+                          second["amenity_ids"][0])
+            self.assertIsNot(first["other_id"], second["other_id"])
+
+    def test_not_interned(self):
+        """Test nothing is interned by default"""
+        first, second = self.reloaded(False)
+        self.assertEqual(first["place_id"], second["place_id"])
+        self.assertIsNot(first["place_id"], second["place_id"])
+
+
+@unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+class TestFileStorageChildren(FileStorageTestCase):
+    """Test the class and foreign key indexes of FileStorage"""
+    def test_all_by_class(self):
+        """Test that all(cls) only returns objects of that class"""
+        storage = self.storage
+        state = State(name="California")
+        city = City(name="Fremont", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+        self.assertEqual(storage.all(State),
+                         {"State." + state.id: state})
+        self.assertEqual(storage.all("City"), {"City." + city.id: city})
+        self.assertEqual(storage.all(Review), {})
+        self.assertEqual(storage.all(BaseModel),
+                         {"State." + state.id: state, "City." + city.id: city})
+        self.assertEqual(storage.count(BaseModel), 2)
+        self.assertEqual(storage.all("BaseModel"), {})
+        storage.delete(city)
+        self.assertEqual(storage.all(City), {})
+
+    def test_children(self):
+        """Test that children follows new, updates and delete"""
+        ca = State(name="California")
+        nv = State(name="Nevada")
+        sf = City(name="San Francisco", state_id=ca.id)
+        la = City(name="Los Angeles", state_id=ca.id)
+        for obj in (ca, nv, sf, la):
+            self.storage.new(obj)
+        self.assertEqual(self.storage.children(City, ca.id), [sf, la])
+        self.assertEqual(self.storage.children(City, nv.id), [])
+        la.state_id = nv.id
+        self.assertEqual(self.storage.children(City, ca.id), [sf])
+        self.storage.new(la)
+        self.assertEqual(self.storage.children(City, nv.id), [la])
+        self.storage.delete(sf)
+        self.assertEqual(self.storage.children(City, ca.id), [])
+
+    def test_model_properties(self):
+        """Test that the file storage relationships use the indexes"""
+        state = State(name="California")
+        city = City(name="San Francisco", state_id=state.id)
+        place = Place(name="Loft", city_id=city.id)
+        review = Review(text="Great", place_id=place.id)
+        amenity = Amenity(name="Wifi")
+        place.amenity_ids.append(amenity.id)
+        for obj in (state, city, place, review, amenity):
+            self.storage.new(obj)
+        self.assertEqual(state.cities, [city])
+        self.assertEqual(place.reviews, [review])
+        self.assertEqual(place.amenities, [amenity])
+        self.assertEqual(Place().amenity_ids, [])
+
+    def test_places_in(self):
+        """Test that places_in gathers places of states and cities once"""
+        ca = State(name="California")
+        nv = State(name="Nevada")
+        sf = City(name="San Francisco", state_id=ca.id)
+        reno = City(name="Reno", state_id=nv.id)
+        loft = Place(name="Loft", city_id=sf.id)
+        barn = Place(name="Barn", city_id=reno.id)
+        for obj in (ca, nv, sf, reno, loft, barn):
+            self.storage.new(obj)
+        self.assertEqual(self.storage.places_in([ca.id], [sf.id]), [loft])
+        self.assertEqual(self.storage.places_in([], [reno.id]), [barn])
+        self.assertEqual(self.storage.places_in(), [loft, barn])
+
+    def test_places_in_amenities(self):
+        """Test that places_in keeps places having every amenity"""
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        loft = Place(name="Loft", city_id="sf")
+        barn = Place(name="Barn", city_id="reno")
+        loft.amenity_ids.extend([wifi.id, pool.id])
+        barn.amenity_ids.append(wifi.id)
+        for obj in (wifi, pool, loft, barn):
+            self.storage.new(obj)
+        self.assertEqual(self.storage.places_in(amenities=[wifi.id]),
+                         [loft, barn])
+        self.assertEqual(self.storage.places_in(
+            amenities=[pool.id, wifi.id]), [loft])
+        self.assertEqual(self.storage.places_in(
+            cities=["reno"], amenities=[pool.id]), [])
+        barn.amenity_ids.append(pool.id)
+        self.storage.new(barn)
+        self.assertEqual(self.storage.places_in(
+            cities=["reno"], amenities=[pool.id]), [barn])
+        self.storage.delete(loft)
+        self.assertEqual(self.storage.places_in(amenities=[pool.id]),
+                         [barn])
+
+    def test_range(self):
+        """Test that range follows new, updates and delete"""
+        places = [Place(name=str(price), price_by_night=price)
+                  for price in (50, 100, 150, 200)]
+        for place in places:
+            self.storage.new(place)
+        self.assertEqual(self.storage.range(Place, "price_by_night", 100,
+                                            150), places[1:3])
+        self.assertEqual(self.storage.range(Place, "price_by_night",
+                                            high=100), places[:2])
+        self.storage.delete(places[0])
+        places[3].price_by_night = 75
+        self.storage.new(places[3])
+        self.assertEqual(self.storage.range("Place", "price_by_night",
+                                            high=100),
+                         [places[3], places[1]])
+        self.assertEqual(self.storage.range(Place, "max_guest", 1), [])
+
+    def test_places_in_ranges(self):
+        """Test that places_in keeps places within every range"""
+        wifi = Amenity(name="Wifi")
+        loft = Place(name="Loft", city_id="sf", price_by_night=120,
+                     max_guest=2)
+        barn = Place(name="Barn", city_id="reno", price_by_night=80,
+                     max_guest=6)
+        loft.amenity_ids.append(wifi.id)
+        for obj in (wifi, loft, barn):
+            self.storage.new(obj)
+        self.assertEqual(self.storage.places_in(
+            ranges={"price_by_night": (None, 100)}), [barn])
+        self.assertEqual(self.storage.places_in(
+            ranges={"price_by_night": (50, 150), "max_guest": (4, None)}),
+            [barn])
+        self.assertEqual(self.storage.places_in(
+            amenities=[wifi.id], ranges={"price_by_night": (100, 150)}),
+            [loft])
+        self.assertEqual(self.storage.places_in(
+            cities=["sf"], ranges={"max_guest": (4, None)}), [])
+
+    def test_places_in_area(self):
+        """Test that places_in keeps places in the box and radius"""
+        loft = Place(name="Loft", latitude=37.77, longitude=-122.42)
+        barn = Place(name="Barn", latitude=39.53, longitude=-119.81)
+        hut = Place(name="Hut", latitude=-17.7, longitude=179.9)
+        for obj in (loft, barn, hut):
+            self.storage.new(obj)
+        self.assertEqual(self.storage.places_in(
+            box=(37, -123, 38, -122)), [loft])
+        self.assertEqual(set(self.storage.places_in(
+            near=(38.5, -121, 350))), {loft, barn})
+        self.assertEqual(self.storage.places_in(
+            near=(38.5, -121, 100)), [])
+        self.assertEqual(self.storage.places_in(
+            box=(-20, 179, -15, -179)), [hut])
+        loft.latitude = 39.5
+        loft.longitude = -119.8
+        self.storage.new(loft)
+        self.storage.delete(barn)
+        self.assertEqual(self.storage.places_in(
+            near=(39.53, -119.81, 10), ranges={"max_guest": (0, 0)}), [loft])
+
+    def test_places_in_text(self):
+        """Test that places_in matches words of places and their reviews"""
+        loft = Place(name="Sunny Loft", description="Close to the bay")
+        barn = Place(name="Old Barn", description="Quiet <b>countryside</b>")
+        review = Review(place_id=loft.id, text="Great view of the bridge")
+        for obj in (loft, barn, review):
+            self.storage.new(obj)
+        self.assertEqual(self.storage.places_in(text="barn"), [barn])
+        self.assertEqual(self.storage.places_in(text="COUNTRY qui"), [barn])
+        self.assertEqual(self.storage.places_in(text="bridge"), [loft])
+        self.assertEqual(self.storage.places_in(text="bridge barn"), [])
+        self.assertEqual(len(self.storage.places_in(text="?")), 2)
+        review.place_id = barn.id
+        self.storage.new(review)
+        self.assertEqual(self.storage.places_in(text="bri"), [barn])
+        self.storage.delete(review)
+        self.assertEqual(self.storage.places_in(text="bridge"), [])
+        self.storage.delete(barn)
+        self.assertEqual(self.storage.places_in(text="old"), [])
+
+    def test_version(self):
+        """Test that version changes with the objects of its class"""
+        state = State(name="California")
+        before = (self.storage.version(State), self.storage.version(City),
+                  self.storage.version())
+        self.storage.new(state)
+        self.assertNotEqual(self.storage.version(State), before[0])
+        self.assertEqual(self.storage.version(City), before[1])
+        self.assertNotEqual(self.storage.version(), before[2])
+        before = self.storage.version("State")
+        self.assertEqual(self.storage.version(State), before)
+        self.storage.delete(state)
+        self.assertNotEqual(self.storage.version(State), before)
+        before = self.storage.version(City)
+        FileStorage._FileStorage__objects = {}
+        self.assertNotEqual(self.storage.version(City), before)
+
+    def test_subscribe(self):
+        """Test that listeners hear about the classes changed"""
+        heard = []
+        self.storage.subscribe(heard.append)
+        try:
+            state = State(name="California")
+            self.storage.new(state)
+            self.storage.delete(state)
+            self.assertEqual(heard, ["State", "State"])
+        finally:
+            FileStorage._FileStorage__listeners.remove(heard.append)
+        self.storage.new(City(name="Reno"))
+        self.assertEqual(heard, ["State", "State"])
+
+    def test_page(self):
+        """Test that page walks a class by (created_at, id)"""
+        states = [State(name=str(i),
+                        created_at="2024-01-0{}T00:00:00.000000".format(i))
+                  for i in range(1, 6)]
+        for state in reversed(states):
+            self.storage.new(state)
+        first = self.storage.page(State, 2)
+        self.assertEqual(first, states[:2])
+        after = (first[-1].created_at.isoformat(timespec="microseconds"),
+                 first[-1].id)
+        self.assertEqual(self.storage.page(State, 2, after), states[2:4])
+        self.storage.delete(states[2])
+        late = State(name="late", created_at="2024-02-01T00:00:00.000000")
+        self.storage.new(late)
+        self.assertEqual(self.storage.page(State, None, after),
+                         [states[3], states[4], late])
+        self.assertEqual(self.storage.places_in(limit=1), [])
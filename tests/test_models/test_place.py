@@ -199,3 +199,30 @@ class TestPlace(unittest.TestCase):
         place = Place()
         string = "[Place] ({}) {}".format(place.id, place.__dict__)
         self.assertEqual(string, str(place))
+
+    def test_distance(self):
+        """test the great-circle distance between two points"""
+        self.assertAlmostEqual(place.distance(0, 0, 0, 1), 111.195, 3)
+        self.assertAlmostEqual(place.distance(0, 179.5, 0, -179.5),
+                               111.195, 3)
+        self.assertEqual(place.distance(37.7, -122.4, 37.7, -122.4), 0)
+
+    def test_bounding_box(self):
+        """test the box around a circle, across the antimeridian too"""
+        south, west, north, east = place.bounding_box(0, 0, 111.195)
+        self.assertAlmostEqual(south, -1, 3)
+        self.assertAlmostEqual(north, 1, 3)
+        self.assertAlmostEqual(west, -1, 3)
+        self.assertAlmostEqual(east, 1, 3)
+        box = place.bounding_box(0, 179.5, 111.195)
+        self.assertGreater(box[1], box[3])
+        self.assertTrue(place.in_box(0, -179.6, box))
+        self.assertFalse(place.in_box(0, 178, box))
+        self.assertEqual(place.bounding_box(89.5, 0, 200)[1:4:2],
+                         (-180, 180))
+
+    def test_words(self):
+        """test that words splits lowercase words once each"""
+        self.assertEqual(place.words("Cozy loft, cozy VIEW!"),
+                         ["cozy", "loft", "view"])
+        self.assertEqual(place.words(""), [])
@@ -0,0 +1,32 @@
+-- upgrades the tables of an existing hbnb database to the current models
+-- DBStorage.reload() creates missing tables but never alters existing ones
+-- run once per database: cat upgrade_mysql_schema.sql | mysql -uroot -p hbnb_dev_db
+
+-- keyset pagination by (created_at, id)
+CREATE INDEX ix_amenities_created_at ON amenities (created_at);
+CREATE INDEX ix_states_created_at ON states (created_at);
+CREATE INDEX ix_users_created_at ON users (created_at);
+CREATE INDEX ix_cities_created_at ON cities (created_at);
+CREATE INDEX ix_places_created_at ON places (created_at);
+CREATE INDEX ix_reviews_created_at ON reviews (created_at);
+
+-- places_search range filters
+CREATE INDEX ix_places_number_rooms ON places (number_rooms);
+CREATE INDEX ix_places_number_bathrooms ON places (number_bathrooms);
+CREATE INDEX ix_places_max_guest ON places (max_guest);
+CREATE INDEX ix_places_price_by_night ON places (price_by_night);
+
+-- places_search bbox and near filters
+CREATE INDEX ix_places_latitude_longitude ON places (latitude, longitude);
+
+-- places_search q filter
+CREATE FULLTEXT INDEX ix_places_name_description ON places (name, description);
+CREATE FULLTEXT INDEX ix_reviews_text ON reviews (text);
+
+-- microsecond timestamps, so ETags change on saves within the same second
+ALTER TABLE amenities MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
+ALTER TABLE states MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
+ALTER TABLE users MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
+ALTER TABLE cities MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
+ALTER TABLE places MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
+ALTER TABLE reviews MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
@@ -24,14 +24,28 @@ window.addEventListener('load', function () {
     });
   
     // task 4
-    $('.filters button').click(function () {
+    // places are fetched 50 at a time: the next page, from the
+    // X-Next-Cursor header, is only requested when the user scrolls near
+    // the end of the list
+    let search = 0;
+    let nextPage = null;
+    let loading = false;
+    function searchPlaces (current, amenities, cursor) {
+      const body = { amenities: amenities, limit: 50 };
+      if (cursor) {
+        body.cursor = cursor;
+      }
+      loading = true;
       $.ajax({
         type: 'POST',
         url: 'http://0.0.0.0:5001/api/v1/places_search/',
         contentType: 'application/json',
-        data: JSON.stringify({ amenities: Object.keys(amenityIds) })
-      }).done(function (data) {
-        $('section.places').empty();
+        data: JSON.stringify(body)
+      }).done(function (data, textStatus, xhr) {
+        if (current !== search) {
+          return;
+        }
+        loading = false;
         // $('section.places').append('<h1>Places</h1>');
         for (const place of data) {
           const template = `<article>
@@ -75,6 +89,33 @@ window.addEventListener('load', function () {
         </article> <!-- End 1 PLACE Article -->`;
           $('section.places').append(template);
         }
+        const next = xhr.getResponseHeader('X-Next-Cursor');
+        nextPage = next ? { search: current, amenities: amenities, cursor: next } : null;
+        loadMore();
+      }).fail(function () {
+        if (current === search) {
+          loading = false;
+        }
       });
+    }
+
+    // requests the next page once the end of the list is within a screen
+    function loadMore () {
+      if (loading || !nextPage || nextPage.search !== search) {
+        return;
+      }
+      const end = $('section.places').offset().top + $('section.places').outerHeight();
+      if (end - $(window).scrollTop() <= 2 * $(window).height()) {
+        searchPlaces(nextPage.search, nextPage.amenities, nextPage.cursor);
+      }
+    }
+
+    $(window).on('scroll resize', loadMore);
+
+    $('.filters button').click(function () {
+      search += 1;
+      nextPage = null;
+      $('section.places').empty();
+      searchPlaces(search, Object.keys(amenityIds));
     });
   });